@@ -0,0 +1,113 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.v1.fast_serializers import (
+    CategoryFastSerializer,
+    CommentFastSerializer,
+    GenreFastSerializer,
+    ReviewFastSerializer,
+    TitleFastSerializer,
+)
+from api.v1.serializers import (
+    CategorySerializer,
+    CommentSerializer,
+    GenreSerializer,
+    ReviewSerializer,
+    TitleGetSerializer,
+)
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+BENCHMARKS = (
+    (
+        'titles',
+        lambda: Title.objects.select_related('category')
+        .prefetch_related('genre').order_by('id'),
+        TitleGetSerializer,
+        TitleFastSerializer,
+    ),
+    (
+        'categories',
+        lambda: Category.objects.order_by('id'),
+        CategorySerializer,
+        CategoryFastSerializer,
+    ),
+    (
+        'genres',
+        lambda: Genre.objects.order_by('id'),
+        GenreSerializer,
+        GenreFastSerializer,
+    ),
+    (
+        'reviews',
+        lambda: Review.objects.select_related('author').order_by('id'),
+        ReviewSerializer,
+        ReviewFastSerializer,
+    ),
+    (
+        'comments',
+        lambda: Comment.objects.select_related('author').order_by('id'),
+        CommentSerializer,
+        CommentFastSerializer,
+    ),
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput of DRF and fast read serializers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=1000,
+            help='Number of rows serialized in one pass',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Number of passes; the best one is reported',
+        )
+
+    def handle(self, *args, limit, repeat, **kwargs):
+        if limit < 1 or repeat < 1:
+            raise CommandError('--limit and --repeat must be positive')
+        renderer = JSONRenderer()
+        for name, queryset, serializer_class, fast_class in BENCHMARKS:
+            drf_time, drf_data = self.measure(repeat, lambda: serializer_class(
+                queryset()[:limit], many=True
+            ).data)
+            fast_serializer = fast_class()
+            fast_time, fast_data = self.measure(
+                repeat,
+                lambda: fast_serializer.serialize(
+                    fast_serializer.rows(queryset()[:limit])
+                ),
+            )
+            if renderer.render(drf_data) != renderer.render(fast_data):
+                raise CommandError(
+                    f'{name}: fast serializer output differs from DRF'
+                )
+            rows = len(drf_data)
+            if not rows:
+                self.stdout.write(f'{name}: no rows')
+                continue
+            self.stdout.write(
+                f'{name}: {rows} rows, '
+                f'drf {rows / drf_time:.0f} rows/s, '
+                f'fast {rows / fast_time:.0f} rows/s, '
+                f'x{drf_time / fast_time:.1f}'
+            )
+
+    @staticmethod
+    def measure(repeat, serialize):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = serialize()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
@@ -0,0 +1,104 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category,
+    Genre,
+    Title,
+    TitleScoreHistogram,
+    TitleTrigram,
+)
+from reviews.signals import bulk_deleted, titles_bulk_saved
+from .v1.autocomplete import AUTOCOMPLETE_INDEXES
+from .v1.pagination import invalidate_counts
+from .v1.title_index import title_bitmap_index
+
+
+CACHED_APP_LABELS = ('reviews',)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def model_changed(sender, **kwargs):
+    if sender._meta.app_label in CACHED_APP_LABELS:
+        transaction.on_commit(partial(invalidate_counts, sender))
+
+
+@receiver(m2m_changed)
+def relation_changed(sender, action, **kwargs):
+    if (
+        action.startswith('post_')
+        and sender._meta.app_label in CACHED_APP_LABELS
+    ):
+        transaction.on_commit(partial(invalidate_counts, sender))
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    transaction.on_commit(partial(
+        title_bitmap_index.update_title,
+        instance.id,
+        instance.year,
+        instance.category_id,
+    ))
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    transaction.on_commit(
+        partial(title_bitmap_index.remove_title, instance.id)
+    )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # Изменение через genre.titles затрагивает один жанр целиком.
+        transaction.on_commit(title_bitmap_index.invalidate)
+        return
+    transaction.on_commit(partial(
+        title_bitmap_index.set_genres,
+        instance.id,
+        pk_set or (),
+        add=action == 'post_add',
+        clear=action == 'post_clear',
+    ))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def title_groups_changed(sender, **kwargs):
+    transaction.on_commit(title_bitmap_index.invalidate)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def autocomplete_source_changed(sender, **kwargs):
+    for index in AUTOCOMPLETE_INDEXES.values():
+        if sender is index.model:
+            transaction.on_commit(index.invalidate)
+
+
+@receiver(bulk_deleted)
+def model_bulk_deleted(sender, **kwargs):
+    transaction.on_commit(partial(invalidate_counts, sender))
+
+
+@receiver(titles_bulk_saved)
+def titles_bulk_changed(sender, **kwargs):
+    for model in (
+        sender, sender.genre.through, TitleScoreHistogram, TitleTrigram
+    ):
+        transaction.on_commit(partial(invalidate_counts, model))
+    transaction.on_commit(title_bitmap_index.invalidate)
+    for index in AUTOCOMPLETE_INDEXES.values():
+        if sender is index.model:
+            transaction.on_commit(index.invalidate)
@@ -0,0 +1,84 @@
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+from reviews.models import Category, Genre, Title, UserProfile
+from reviews.text import normalize
+
+
+class PrefixIndex:
+    """Отсортированный массив ключей для поиска по началу слова.
+
+    Для каждого слова названия хранится ключ — название, начиная с этого
+    слова, поэтому «оре» находит «Крепкий орешек». Поиск — двоичный поиск
+    первого ключа не меньше запроса и проход вперед, пока ключи начинаются
+    с запроса. Индекс перестраивается при первом запросе после записи в
+    модель этим процессом или по истечении AUTOCOMPLETE_INDEX_MAX_AGE.
+    """
+
+    def __init__(self, model, field, payload_fields):
+        self.model = model
+        self.field = field
+        self.payload_fields = payload_fields
+        self.lock = threading.Lock()
+        self.built_at = None
+
+    def build(self):
+        entries = []
+        for row in self.model.objects.values(self.field, *self.payload_fields):
+            words = normalize(row[self.field]).split(' ')
+            payload = {field: row[field] for field in self.payload_fields}
+            for start in range(len(words)):
+                entries.append((' '.join(words[start:]), start, payload))
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        self.entries = (
+            [entry[0] for entry in entries],
+            [entry[2] for entry in entries],
+        )
+        self.built_at = time.monotonic()
+
+    def invalidate(self):
+        self.built_at = None
+
+    def ensure_built(self):
+        max_age = getattr(settings, 'AUTOCOMPLETE_INDEX_MAX_AGE', 60)
+        if (
+            self.built_at is None
+            or time.monotonic() - self.built_at > max_age
+        ):
+            with self.lock:
+                if self.built_at is None or (
+                    time.monotonic() - self.built_at > max_age
+                ):
+                    self.build()
+
+    def search(self, text, limit):
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        self.ensure_built()
+        keys, payloads = self.entries
+        results, seen = [], set()
+        position = bisect_left(keys, prefix)
+        while (
+            position < len(keys)
+            and keys[position].startswith(prefix)
+            and len(results) < limit
+        ):
+            payload = payloads[position]
+            identity = tuple(payload.values())
+            if identity not in seen:
+                seen.add(identity)
+                results.append(payload)
+            position += 1
+        return results
+
+
+AUTOCOMPLETE_INDEXES = {
+    'title': PrefixIndex(Title, 'name', ('id', 'name')),
+    'genre': PrefixIndex(Genre, 'name', ('name', 'slug')),
+    'category': PrefixIndex(Category, 'name', ('name', 'slug')),
+    'user': PrefixIndex(UserProfile, 'username', ('username',)),
+}
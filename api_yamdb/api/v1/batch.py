@@ -0,0 +1,95 @@
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import unquote_to_bytes, urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.utils.encoding import iri_to_uri
+
+
+BATCH_MAX_WORKERS = 4
+BATCH_ITEM_ERROR = {'detail': 'Внутренняя ошибка сервера.'}
+
+logger = logging.getLogger(__name__)
+
+
+def sub_request(request, method, url, body):
+    """Внутренний запрос с заголовками, в том числе авторизацией, исходного.
+
+    Адрес приводится к виду, в котором его передает WSGI-сервер: строка
+    запроса в процентной кодировке, путь — байты UTF-8 в строке latin-1.
+    """
+    parts = urlsplit(iri_to_uri(url))
+    content = b'' if body is None else json.dumps(body).encode()
+    environ = {
+        **request.META,
+        'REQUEST_METHOD': method,
+        'PATH_INFO': unquote_to_bytes(parts.path).decode('iso-8859-1'),
+        'QUERY_STRING': parts.query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(content)),
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': BytesIO(content),
+    }
+    return WSGIRequest(environ)
+
+
+def execute(request, item):
+    """Выполняет один подзапрос пакета и замеряет его время.
+
+    Подзапрос вызывает представление напрямую, минуя цепочку middleware:
+    сессии, CSRF и прочие middleware к нему не применяются. Исключение
+    представления дает ответ 500 только этому элементу пакета.
+    """
+    started = time.perf_counter()
+    sub = sub_request(request, item['method'], item['url'], item.get('body'))
+    # Маршрут ищется по декодированному пути, как для обычного запроса.
+    path = sub.path_info
+    try:
+        match = resolve(path)
+    except Resolver404:
+        status, body = 404, {'detail': f'Адрес {path} не найден.'}
+    else:
+        sub.resolver_match = match
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            status = response.status_code
+            body = json.loads(response.content) if response.content else None
+        except Exception:
+            logger.exception('Batch item %s %s failed', item['method'], path)
+            status, body = 500, BATCH_ITEM_ERROR
+    return {
+        'status': status,
+        'body': body,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def execute_in_thread(request, item):
+    try:
+        return execute(request, item)
+    finally:
+        # Соединения с БД потоков пула не переиспользуются Django.
+        connections.close_all()
+
+
+def execute_batch(request, items, concurrent=False):
+    """Выполняет подзапросы пакета и возвращает их ответы по порядку.
+
+    Параллельно выполняются только пакеты из одних GET-запросов: запросы
+    на запись идут последовательно, чтобы сохранить их порядок.
+    """
+    if concurrent and items and all(item['method'] == 'GET' for item in items):
+        with ThreadPoolExecutor(
+            max_workers=min(BATCH_MAX_WORKERS, len(items))
+        ) as executor:
+            return list(executor.map(
+                lambda item: execute_in_thread(request, item), items
+            ))
+    return [execute(request, item) for item in items]
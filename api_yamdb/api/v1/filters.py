@@ -1,12 +1,55 @@
+from functools import reduce
+from operator import or_
+
 import django_filters
+from django.db.models import Count, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+from reviews.models import Title
+from reviews.search import full_text_search
+from reviews.text import normalize
+
+
+GENRE_MODE_ANY = 'any'
+GENRE_MODE_ALL = 'all'
+# Верхняя граница диапазона префикса: максимальный символ Unicode больше
+# любого символа, который может следовать за префиксом.
+PREFIX_UPPER_BOUND = '\U0010ffff'
+TITLE_IDS_MAX_COUNT = 300
+# Допустимые значения ?ordering= для произведений и хранимые поля, по
+# которым идет сортировка. Под каждое поле есть индекс (поле, id).
+TITLE_ORDERING_FIELDS = {
+    'name': 'name_sort',
+    'year': 'year',
+    'rating': 'rating',
+    'review_count': 'rating_count',
+}
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    pass
+
+
+class NumberInFilter(
+    django_filters.BaseInFilter, django_filters.NumberFilter
+):
+    pass
 
 
 class TitleFilter(django_filters.FilterSet):
-    category = django_filters.CharFilter(
+    ids = NumberInFilter(
+        method='filter_ids',
+    )
+    category = CharInFilter(
         field_name='category__slug',
     )
-    genre = django_filters.CharFilter(
-        field_name='genre__slug',
+    genre = CharInFilter(
+        method='filter_genre',
+    )
+    genre_mode = django_filters.ChoiceFilter(
+        choices=((GENRE_MODE_ANY, 'any'), (GENRE_MODE_ALL, 'all')),
+        method='filter_genre_mode',
     )
     name = django_filters.CharFilter(
         field_name='name',
@@ -14,3 +57,117 @@ class TitleFilter(django_filters.FilterSet):
     year = django_filters.NumberFilter(
         field_name='year',
     )
+    year_min = django_filters.NumberFilter(
+        field_name='year',
+        lookup_expr='gte',
+    )
+    year_max = django_filters.NumberFilter(
+        field_name='year',
+        lookup_expr='lte',
+    )
+    rating_min = django_filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='gte',
+    )
+    rating_max = django_filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='lte',
+    )
+
+    def filter_ids(self, queryset, name, ids):
+        # Пустые элементы списка (?ids=, или ?ids=1,) приходят как None.
+        ids = [title_id for title_id in ids if title_id is not None]
+        if not ids:
+            # Как и другие фильтры с пустым значением, не ограничивает выборку.
+            return queryset
+        if len(ids) > TITLE_IDS_MAX_COUNT:
+            raise ValidationError({name: [
+                f'Не больше {TITLE_IDS_MAX_COUNT} id в одном запросе.'
+            ]})
+        return queryset.filter(id__in=ids)
+
+    def filter_genre(self, queryset, name, slugs):
+        # Отбор через подзапрос к связующей таблице не размножает строки
+        # произведений с несколькими подходящими жанрами.
+        links = Title.genre.through.objects.filter(genre__slug__in=slugs)
+        if self.form.cleaned_data.get('genre_mode') == GENRE_MODE_ALL:
+            links = (
+                links.values('title_id')
+                .annotate(matched=Count('genre_id', distinct=True))
+                .filter(matched=len(set(slugs)))
+            )
+        return queryset.filter(id__in=links.values('title_id'))
+
+    def filter_genre_mode(self, queryset, name, value):
+        return queryset
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск по параметру ?q= с сортировкой по релевантности."""
+
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return full_text_search(queryset, text)
+
+
+class NormalizedPrefixSearchFilter(SearchFilter):
+    """Поиск ?search= по началу нормализованного поля.
+
+    Запрос приводится к нижнему регистру, «ё» заменяется на «е», и по
+    полям search_fields ищутся значения из диапазона
+    [запрос, запрос + PREFIX_UPPER_BOUND). Такое условие, в отличие от
+    icontains, выполняется по обычному индексу столбца.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = normalize(request.query_params.get(self.search_param, ''))
+        search_fields = self.get_search_fields(view, request)
+        if not text or not search_fields:
+            return queryset
+        return queryset.filter(reduce(or_, (
+            Q(**{
+                f'{field}__gte': text,
+                f'{field}__lt': text + PREFIX_UPPER_BOUND,
+            })
+            for field in search_fields
+        )))
+
+
+class TitleOrderingFilter(BaseFilterBackend):
+    """Сортировка произведений по ?ordering=-rating,year.
+
+    Принимаются только поля из TITLE_ORDERING_FIELDS. Последним ключом
+    добавляется id в направлении последнего поля: порядок однозначен для
+    пагинации, а сортировка по одному полю идет по индексу (поле, id).
+    Курсорная пагинация идет только по уникальному полю, поэтому вместе
+    с ?cursor= параметр не принимается.
+    """
+
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.ordering_param, '')
+        terms = [term.strip() for term in value.split(',') if term.strip()]
+        if not terms:
+            return queryset
+        cursor_param = getattr(view.paginator, 'cursor_query_param', None)
+        if cursor_param in request.query_params:
+            raise ValidationError({self.ordering_param: [
+                f'Сортировка не поддерживается вместе с ?{cursor_param}=.'
+            ]})
+        ordering = []
+        for term in terms:
+            name = term.removeprefix('-')
+            if name not in TITLE_ORDERING_FIELDS:
+                raise ValidationError({self.ordering_param: [
+                    f'Сортировка по полю «{name}» не поддерживается. '
+                    f'Допустимые поля: {", ".join(TITLE_ORDERING_FIELDS)}.'
+                ]})
+            direction = '-' if term.startswith('-') else ''
+            ordering.append(direction + TITLE_ORDERING_FIELDS[name])
+        ordering.append(direction + 'id')
+        return queryset.order_by(*ordering)
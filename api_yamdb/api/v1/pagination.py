@@ -0,0 +1,165 @@
+from functools import partial
+from hashlib import sha1
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+COUNT_GENERATION_KEY = 'count-generation:{}'
+
+
+def count_generation_key(model):
+    return COUNT_GENERATION_KEY.format(model._meta.label_lower)
+
+
+def invalidate_counts(model):
+    """Делает устаревшими закешированные количества, зависящие от модели."""
+    key = count_generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Начальное значение от времени не совпадет с поколением,
+        # под которым количества кешировались до вытеснения ключа.
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def count_generations(models):
+    keys = [count_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in set(keys) - generations.keys():
+        cache.add(key, time.time_ns(), timeout=None)
+        generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def count_dependencies(model):
+    """Модель и связанные с ней модели, от которых зависят ее выборки."""
+    models = {model}
+    for field in model._meta.get_fields():
+        if field.related_model is not None:
+            models.add(field.related_model)
+        if field.many_to_many and not field.auto_created:
+            models.add(field.remote_field.through)
+    return sorted(models, key=lambda related: related._meta.label_lower)
+
+
+class CachedCountPaginator(Paginator):
+
+    def __init__(self, *args, pagination, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pagination = pagination
+
+    @cached_property
+    def count(self):
+        return self.pagination.get_count(self.object_list)
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Постраничная пагинация с кешированием общего количества объектов.
+
+    Количество кешируется по SQL-запросу подсчета, то есть по итоговому
+    набору фильтров, и сбрасывается записью в модель выборки или в
+    связанные с ней модели. Если точный подсчет по таблице дорог и СУБД
+    умеет оценивать размер таблиц, отдается оценка с флагом approximate.
+    """
+
+    count_cache_timeout = 300
+    count_estimate_threshold = 100_000
+
+    @property
+    def django_paginator_class(self):
+        return partial(CachedCountPaginator, pagination=self)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.approximate = False
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        if not isinstance(queryset, QuerySet):
+            return len(queryset)
+        try:
+            key = self.get_count_cache_key(queryset)
+        except EmptyResultSet:
+            # Условие, которое не выполняется ни для одной записи
+            # (none(), __in=[]), не компилируется в SQL.
+            return 0
+        count = cache.get(key)
+        if count is not None:
+            return count
+        estimate = self.estimate_count(queryset)
+        if estimate is not None:
+            self.approximate = True
+            return estimate
+        count = queryset.count()
+        cache.set(key, count, self.count_cache_timeout)
+        return count
+
+    def get_count_cache_key(self, queryset):
+        generations = count_generations(count_dependencies(queryset.model))
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = sha1(repr((sql, params, generations)).encode()).hexdigest()
+        return f'count:{queryset.model._meta.label_lower}:{digest}'
+
+    def estimate_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < self.count_estimate_threshold:
+            return None
+        return int(row[0])
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.approximate:
+            response.data['approximate'] = True
+        return response
+
+
+class CursorOrPageNumberPagination(PageNumberPagination):
+    """Постраничная пагинация, параметр ?cursor= включает курсорную.
+
+    Курсорная пагинация идет по индексу от последней выданной записи,
+    поэтому страница стоит одинаково на любой глубине. Поле сортировки
+    задается атрибутом cursor_ordering представления и должно быть
+    уникальным.
+    """
+
+    cursor_query_param = 'cursor'
+    cursor_ordering = 'id'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = CursorPagination()
+        self.cursor_paginator.cursor_query_param = self.cursor_query_param
+        self.cursor_paginator.page_size = self.get_page_size(request)
+        self.cursor_paginator.ordering = getattr(
+            view, 'cursor_ordering', self.cursor_ordering
+        )
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class CursorOrCachedCountPagination(
+    CursorOrPageNumberPagination, CachedCountPagination
+):
+    pass
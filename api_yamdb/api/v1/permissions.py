@@ -11,6 +11,14 @@ class IsAdmin(BasePermission):
         return request.user.is_authenticated and request.user.is_admin
 
 
+class IsModerator(BasePermission):
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_admin or request.user.is_moderator
+        )
+
+
 class ReadOnly(BasePermission):
 
     def has_permission(self, request, view):
@@ -1,10 +1,14 @@
+from urllib.parse import unquote, urlsplit
+
 from rest_framework.serializers import (
     ModelSerializer,
+    FloatField,
     IntegerField,
     SlugRelatedField,
     Serializer,
 )
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth import get_user_model
 from django.contrib.auth.validators import UnicodeUsernameValidator
 
@@ -16,12 +20,78 @@ from reviews.models import (
     Comment,
     USERNAME_MAX_LENGTH,
     EMAIL_MAX_LENGTH,
+    TITLE_MAX_LENGTH,
 )
-from reviews.validators import forbidden_names_validator
+from reviews.search import TITLE_FACETS
+from reviews.validators import forbidden_names_validator, year_validator
 
 
 User = get_user_model()
 
+TOP_TITLES_DEFAULT_LIMIT = 10
+TOP_TITLES_MAX_LIMIT = 100
+FUZZY_TITLES_DEFAULT_LIMIT = 10
+FUZZY_TITLES_MAX_LIMIT = 50
+AUTOCOMPLETE_KINDS = ('title', 'genre', 'category', 'user')
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+AUTOCOMPLETE_QUERY_MAX_LENGTH = 100
+TITLES_BULK_MAX_COUNT = 10000
+MODERATION_IDS_MAX_COUNT = 10000
+BATCH_MAX_REQUESTS = 20
+BATCH_METHODS = ('GET', 'POST', 'PATCH', 'DELETE')
+BATCH_URL_PREFIX = '/api/v1/'
+BATCH_URL = f'{BATCH_URL_PREFIX}batch/'
+TITLE_PAGE_DEFAULT_REVIEWS = 20
+TITLE_PAGE_MAX_REVIEWS = 100
+TITLE_PAGE_DEFAULT_COMMENTS = 3
+TITLE_PAGE_MAX_COMMENTS = 20
+FORMAT_MODE_NESTED = 'nested'
+FORMAT_MODE_NORMALIZED = 'normalized'
+LAYOUT_ROWS = 'rows'
+LAYOUT_COLUMNAR = 'columnar'
+SPARSE_FIELDS_PARAM = 'fields'
+SPARSE_OMIT_PARAM = 'omit'
+
+
+def sparse_fieldset(params, names):
+    """Имена полей ответа, оставшиеся после ?fields= и ?omit=."""
+    selected = list(names)
+    for param, keep in (
+        (SPARSE_FIELDS_PARAM, True), (SPARSE_OMIT_PARAM, False)
+    ):
+        if param not in params:
+            continue
+        requested = {
+            name.strip() for name in params[param].split(',') if name.strip()
+        }
+        unknown = requested - set(names)
+        if unknown:
+            raise serializers.ValidationError({param: [
+                f'Неизвестные поля: {", ".join(sorted(unknown))}. '
+                f'Доступны: {", ".join(names)}.'
+            ]})
+        selected = [name for name in selected if (name in requested) == keep]
+    return selected
+
+
+class SparseFieldsetMixin:
+    """Оставляет в ответе поля из ?fields= и убирает поля из ?omit=.
+
+    Действует только на чтение и только на сериализатор верхнего уровня:
+    вложенные сериализаторы создаются без запроса в контексте.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        selected = sparse_fieldset(request.query_params, list(self.fields))
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
 
 class SignupSerializer(Serializer):
     username = serializers.CharField(
@@ -65,7 +135,7 @@ class TokenSerializer(Serializer):
     confirmation_code = serializers.CharField(required=True)
 
 
-class UserSerializer(ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, ModelSerializer):
 
     class Meta:
         model = User
@@ -84,7 +154,7 @@ class UserUpdateSerializer(UserSerializer):
         read_only_fields = ('role',)
 
 
-class CategorySerializer(ModelSerializer):
+class CategorySerializer(SparseFieldsetMixin, ModelSerializer):
 
     class Meta:
         model = Category
@@ -92,7 +162,7 @@ class CategorySerializer(ModelSerializer):
         lookup_field = 'slug'
 
 
-class GenreSerializer(ModelSerializer):
+class GenreSerializer(SparseFieldsetMixin, ModelSerializer):
 
     class Meta:
         model = Genre
@@ -100,11 +170,12 @@ class GenreSerializer(ModelSerializer):
         lookup_field = 'slug'
 
 
-class TitleGetSerializer(ModelSerializer):
+class TitleGetSerializer(SparseFieldsetMixin, ModelSerializer):
 
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
-    rating = IntegerField(default=None)
+    rating = IntegerField(read_only=True)
+    review_count = IntegerField(source='rating_count', read_only=True)
 
     class Meta:
         model = Title
@@ -116,9 +187,142 @@ class TitleGetSerializer(ModelSerializer):
             'genre',
             'category',
             'rating',
+            'review_count',
         )
 
 
+class TitleNormalizedSerializer(TitleGetSerializer):
+    """Произведение со ссылками на категорию и жанры по слагу."""
+
+    category = SlugRelatedField(read_only=True, slug_field='slug')
+    genre = SlugRelatedField(read_only=True, slug_field='slug', many=True)
+
+
+class TitleTopSerializer(TitleGetSerializer):
+
+    weighted_rating = FloatField(read_only=True)
+
+    class Meta(TitleGetSerializer.Meta):
+        fields = TitleGetSerializer.Meta.fields + ('weighted_rating',)
+
+
+class TopTitlesQuerySerializer(Serializer):
+    category = serializers.SlugField(required=False)
+    genre = serializers.SlugField(required=False)
+    limit = IntegerField(
+        required=False,
+        default=TOP_TITLES_DEFAULT_LIMIT,
+        min_value=1,
+        max_value=TOP_TITLES_MAX_LIMIT,
+    )
+
+
+class TitleFuzzySerializer(TitleGetSerializer):
+
+    similarity = FloatField(read_only=True)
+
+    class Meta(TitleGetSerializer.Meta):
+        fields = TitleGetSerializer.Meta.fields + ('similarity',)
+
+
+class FuzzyTitlesQuerySerializer(Serializer):
+    q = serializers.CharField(max_length=TITLE_MAX_LENGTH)
+    limit = IntegerField(
+        required=False,
+        default=FUZZY_TITLES_DEFAULT_LIMIT,
+        min_value=1,
+        max_value=FUZZY_TITLES_MAX_LIMIT,
+    )
+
+
+class ListLayoutQuerySerializer(Serializer):
+    layout = serializers.ChoiceField(
+        choices=(LAYOUT_ROWS, LAYOUT_COLUMNAR),
+        required=False,
+        default=LAYOUT_ROWS,
+    )
+
+
+class TitleListQuerySerializer(ListLayoutQuerySerializer):
+    facets = serializers.CharField(required=False)
+    format_mode = serializers.ChoiceField(
+        choices=(FORMAT_MODE_NESTED, FORMAT_MODE_NORMALIZED),
+        required=False,
+        default=FORMAT_MODE_NESTED,
+    )
+
+    def validate(self, data):
+        if (
+            data['layout'] == LAYOUT_COLUMNAR
+            and data['format_mode'] == FORMAT_MODE_NORMALIZED
+        ):
+            raise serializers.ValidationError(
+                'Режим format_mode=normalized не сочетается с '
+                'layout=columnar.'
+            )
+        return data
+
+    def validate_facets(self, value):
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = set(names) - set(TITLE_FACETS)
+        if unknown:
+            raise serializers.ValidationError(
+                f'Неизвестные срезы: {", ".join(sorted(unknown))}. '
+                f'Доступны: {", ".join(TITLE_FACETS)}.'
+            )
+        return list(dict.fromkeys(names))
+
+
+class TitlePageQuerySerializer(Serializer):
+    reviews = IntegerField(
+        required=False,
+        default=TITLE_PAGE_DEFAULT_REVIEWS,
+        min_value=0,
+        max_value=TITLE_PAGE_MAX_REVIEWS,
+    )
+    comments_per_review = IntegerField(
+        required=False,
+        default=TITLE_PAGE_DEFAULT_COMMENTS,
+        min_value=0,
+        max_value=TITLE_PAGE_MAX_COMMENTS,
+    )
+
+
+class BatchItemSerializer(Serializer):
+    method = serializers.ChoiceField(
+        choices=BATCH_METHODS, required=False, default='GET'
+    )
+    url = serializers.CharField()
+    body = serializers.JSONField(required=False)
+
+    def validate_url(self, value):
+        if not value.startswith(BATCH_URL_PREFIX):
+            raise serializers.ValidationError(
+                f'Адрес должен начинаться с {BATCH_URL_PREFIX}.'
+            )
+        # Путь сверяется в декодированном виде, в котором он разрешается.
+        if unquote(urlsplit(value).path).startswith(BATCH_URL):
+            raise serializers.ValidationError(
+                'Пакет не может содержать пакетные запросы.'
+            )
+        return value
+
+
+class BatchQuerySerializer(Serializer):
+    concurrent = serializers.BooleanField(required=False, default=False)
+
+
+class AutocompleteQuerySerializer(Serializer):
+    q = serializers.CharField(max_length=AUTOCOMPLETE_QUERY_MAX_LENGTH)
+    kind = serializers.ChoiceField(choices=AUTOCOMPLETE_KINDS)
+    limit = IntegerField(
+        required=False,
+        default=AUTOCOMPLETE_DEFAULT_LIMIT,
+        min_value=1,
+        max_value=AUTOCOMPLETE_MAX_LIMIT,
+    )
+
+
 class TitleWriteSerializer(ModelSerializer):
 
     category = SlugRelatedField(
@@ -140,7 +344,134 @@ class TitleWriteSerializer(ModelSerializer):
         return TitleGetSerializer(instance).data
 
 
-class ReviewSerializer(ModelSerializer):
+class TitleBulkListSerializer(serializers.ListSerializer):
+    """Пакет строк записи произведений.
+
+    Слаги категорий и жанров и id обновляемых произведений всего пакета
+    проверяются тремя запросами. Строки получают id категории и жанров,
+    ошибки возвращаются списком по строкам, как и ошибки полей: поэтому
+    проверка идет в to_internal_value(), а не в validate(), ошибки
+    которого DRF оборачивает в non_field_errors.
+    """
+
+    def to_internal_value(self, data):
+        rows = super().to_internal_value(data)
+        category_ids = dict(Category.objects.filter(
+            slug__in={row['category'] for row in rows}
+        ).values_list('slug', 'id'))
+        genre_ids = dict(Genre.objects.filter(
+            slug__in={slug for row in rows for slug in row['genre']}
+        ).values_list('slug', 'id'))
+        title_ids = set(Title.objects.filter(
+            id__in=[row['id'] for row in rows if 'id' in row]
+        ).values_list('id', flat=True))
+        seen_ids = set()
+        resolved, errors = [], []
+        for row in rows:
+            row_errors = {}
+            if row['category'] not in category_ids:
+                row_errors['category'] = [
+                    f'Категории {row["category"]} не существует.'
+                ]
+            unknown = [slug for slug in row['genre'] if slug not in genre_ids]
+            if unknown:
+                row_errors['genre'] = [
+                    f'Жанров {", ".join(unknown)} не существует.'
+                ]
+            if 'id' in row:
+                if row['id'] not in title_ids:
+                    row_errors['id'] = [
+                        f'Произведения {row["id"]} не существует.'
+                    ]
+                elif row['id'] in seen_ids:
+                    row_errors['id'] = ['Произведение указано дважды.']
+                seen_ids.add(row['id'])
+            errors.append(row_errors)
+            resolved.append({
+                **row,
+                'category_id': category_ids.get(row['category']),
+                'genre_ids': [genre_ids.get(slug) for slug in row['genre']],
+            })
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return resolved
+
+
+class TitleBulkItemSerializer(Serializer):
+    """Строка пакетной записи: без id создает произведение, с id заменяет."""
+
+    id = IntegerField(required=False, min_value=1)
+    name = serializers.CharField(max_length=TITLE_MAX_LENGTH)
+    year = IntegerField(validators=[year_validator])
+    description = serializers.CharField(
+        required=False, allow_blank=True, default=''
+    )
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
+    )
+    category = serializers.SlugField()
+
+    class Meta:
+        list_serializer_class = TitleBulkListSerializer
+
+
+class ReviewModerationSerializer(Serializer):
+    """Отбор отзывов для пакетного удаления: условия объединяются через И."""
+
+    ids = serializers.ListField(
+        child=IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MODERATION_IDS_MAX_COUNT,
+    )
+    author = serializers.CharField(
+        required=False, max_length=USERNAME_MAX_LENGTH
+    )
+    title = IntegerField(required=False, min_value=1)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    lookups = {
+        'ids': 'id__in',
+        'author': 'author__username',
+        'title': 'title_id',
+        'since': 'pub_date__gte',
+        'until': 'pub_date__lt',
+    }
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError(
+                'Укажите хотя бы одно условие отбора.'
+            )
+        if 'since' in data and 'until' in data and (
+            data['since'] >= data['until']
+        ):
+            raise serializers.ValidationError(
+                {'until': ['Конец периода должен быть позже начала.']}
+            )
+        return data
+
+    def filter_queryset(self, queryset):
+        return queryset.filter(**{
+            self.lookups[name]: value
+            for name, value in self.validated_data.items()
+        })
+
+
+class CommentModerationSerializer(ReviewModerationSerializer):
+    """Отбор комментариев для пакетного удаления."""
+
+    review = IntegerField(required=False, min_value=1)
+
+    lookups = {
+        **ReviewModerationSerializer.lookups,
+        'title': 'review__title_id',
+        'review': 'review_id',
+    }
+
+
+class ReviewSerializer(SparseFieldsetMixin, ModelSerializer):
     author = SlugRelatedField(
         read_only=True,
         slug_field='username',
@@ -148,7 +479,8 @@ class ReviewSerializer(ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'author', 'text', 'score', 'pub_date')
+        fields = ('id', 'author', 'text', 'score', 'pub_date', 'comment_count')
+        read_only_fields = ('comment_count',)
 
     def validate(self, data):
         if self.context['request'].method == 'POST':
@@ -165,7 +497,14 @@ class ReviewSerializer(ModelSerializer):
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class ReviewSearchSerializer(ReviewSerializer):
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+        read_only_fields = ReviewSerializer.Meta.read_only_fields + ('title',)
+
+
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username',
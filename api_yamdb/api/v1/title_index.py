@@ -0,0 +1,190 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+
+from reviews.models import Category, Genre, Title
+from .filters import GENRE_MODE_ALL, TitleFilter
+
+
+class BitmapIds:
+    """Упорядоченные по возрастанию id из битовой маски.
+
+    Поддерживает len() и срезы, поэтому пагинатор берет из маски только
+    id текущей страницы.
+    """
+
+    def __init__(self, bits):
+        self.bits = bits
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __getitem__(self, page):
+        if not isinstance(page, slice):
+            raise TypeError('BitmapIds supports only slices')
+        start, stop, _ = page.indices(len(self))
+        digits = bin(self.bits)[:1:-1]
+        ids = []
+        position = digits.find('1')
+        for index in range(stop):
+            if index >= start:
+                ids.append(position)
+            position = digits.find('1', position + 1)
+        return ids
+
+
+class TitleBitmapIndex:
+    """Битовые маски id произведений по жанрам, категориям и годам.
+
+    Маска — целое число, в котором бит с номером id произведения
+    установлен, если произведение входит в множество. Пересечение и
+    объединение масок дают ответ на комбинации фильтров TitleFilter без
+    запроса к базе. Индекс живет в памяти процесса: записи этого процесса
+    применяются сигналами после коммита, записи других процессов
+    становятся видны после перестроения раз в TITLE_BITMAP_INDEX_MAX_AGE
+    секунд.
+    """
+
+    supported_params = {
+        'genre', 'genre_mode', 'category', 'year', 'year_min', 'year_max',
+        'page', 'facets', 'fields', 'omit', 'format_mode',
+    }
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.built_at = None
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'TITLE_BITMAP_INDEX_ENABLED', False)
+
+    def build(self):
+        with self.lock:
+            self._build()
+
+    def _build(self):
+        all_ids = 0
+        by_year, by_category, by_genre = {}, {}, {}
+        title_keys = {}
+        for title_id, year, category_id in Title.objects.values_list(
+            'id', 'year', 'category_id'
+        ):
+            bit = 1 << title_id
+            all_ids |= bit
+            by_year[year] = by_year.get(year, 0) | bit
+            by_category[category_id] = by_category.get(category_id, 0) | bit
+            title_keys[title_id] = (year, category_id)
+        for title_id, genre_id in Title.genre.through.objects.values_list(
+            'title_id', 'genre_id'
+        ):
+            by_genre[genre_id] = by_genre.get(genre_id, 0) | 1 << title_id
+        self.all_ids = all_ids
+        self.by_year = by_year
+        self.by_category = by_category
+        self.by_genre = by_genre
+        self.title_keys = title_keys
+        self.category_ids = dict(Category.objects.values_list('slug', 'id'))
+        self.genre_ids = dict(Genre.objects.values_list('slug', 'id'))
+        self.built_at = time.monotonic()
+
+    def invalidate(self):
+        with self.lock:
+            self.built_at = None
+
+    def ensure_built(self):
+        max_age = getattr(settings, 'TITLE_BITMAP_INDEX_MAX_AGE', 60)
+        built_at = self.built_at
+        if built_at is None or time.monotonic() - built_at > max_age:
+            self.build()
+
+    def update_title(self, title_id, year, category_id):
+        with self.lock:
+            if self.built_at is None:
+                return
+            self.remove_title(title_id, keep_genres=True)
+            bit = 1 << title_id
+            self.all_ids |= bit
+            self.by_year[year] = self.by_year.get(year, 0) | bit
+            self.by_category[category_id] = (
+                self.by_category.get(category_id, 0) | bit
+            )
+            self.title_keys[title_id] = (year, category_id)
+
+    def remove_title(self, title_id, keep_genres=False):
+        with self.lock:
+            if self.built_at is None or title_id not in self.title_keys:
+                return
+            mask = ~(1 << title_id)
+            year, category_id = self.title_keys.pop(title_id)
+            self.all_ids &= mask
+            self.by_year[year] &= mask
+            self.by_category[category_id] &= mask
+            if not keep_genres:
+                self.set_genres(title_id, (), add=False, clear=True)
+
+    def set_genres(self, title_id, genre_ids, add, clear=False):
+        with self.lock:
+            if self.built_at is None:
+                return
+            bit = 1 << title_id
+            if clear:
+                genre_ids = list(self.by_genre)
+            for genre_id in genre_ids:
+                bits = self.by_genre.get(genre_id, 0)
+                self.by_genre[genre_id] = bits | bit if add else bits & ~bit
+
+    def match(self, params):
+        """Id произведений под фильтры или None, если нужен запрос к БД."""
+        if not self.enabled or not set(params) <= self.supported_params:
+            return None
+        filterset = TitleFilter(params, queryset=Title.objects.none())
+        if not filterset.is_valid():
+            return None
+        self.ensure_built()
+        data = filterset.form.cleaned_data
+        with self.lock:
+            bits = self.all_ids
+            if data.get('category'):
+                bits &= self.union(
+                    self.by_category, self.category_ids, data['category']
+                )
+            if data.get('genre'):
+                if data.get('genre_mode') == GENRE_MODE_ALL:
+                    for slug in data['genre']:
+                        bits &= self.union(
+                            self.by_genre, self.genre_ids, [slug]
+                        )
+                else:
+                    bits &= self.union(
+                        self.by_genre, self.genre_ids, data['genre']
+                    )
+            bits &= self.years(
+                data.get('year'), data.get('year_min'), data.get('year_max')
+            )
+        return BitmapIds(bits)
+
+    @staticmethod
+    def union(bitmaps, ids, slugs):
+        bits = 0
+        for slug in slugs:
+            if slug in ids:
+                bits |= bitmaps.get(ids[slug], 0)
+        return bits
+
+    def years(self, year, year_min, year_max):
+        if year is None and year_min is None and year_max is None:
+            return self.all_ids
+        bits = 0
+        for value, year_bits in self.by_year.items():
+            if (
+                (year is None or Decimal(value) == year)
+                and (year_min is None or value >= year_min)
+                and (year_max is None or value <= year_max)
+            ):
+                bits |= year_bits
+        return bits
+
+
+title_bitmap_index = TitleBitmapIndex()
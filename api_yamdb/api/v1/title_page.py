@@ -0,0 +1,83 @@
+from collections import defaultdict
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.http import Http404
+
+from reviews.models import Comment, Review, Title, UserProfile
+from .fast_serializers import DATETIME_FIELD, TitleFastSerializer
+
+
+def title_page(title_id, reviews_limit, comments_limit):
+    """Произведение с первыми отзывами и первыми комментариями к ним.
+
+    Число запросов не зависит от числа отзывов: произведение и его жанры,
+    затем по одному пакетному запросу на отзывы, комментарии и авторов.
+    Комментарии ограничиваются оконной функцией ROW_NUMBER() в разрезе
+    отзыва, поэтому из базы приходит не больше comments_limit на отзыв.
+    """
+    title_serializer = TitleFastSerializer()
+    titles = title_serializer.serialize(
+        title_serializer.rows(Title.objects.filter(pk=title_id))
+    )
+    if not titles:
+        raise Http404
+    reviews = list(
+        Review.objects.filter(title_id=title_id)
+        .order_by('id')
+        .values(
+            'id', 'author_id', 'text', 'score', 'pub_date', 'comment_count'
+        )[:reviews_limit]
+    )
+    comments = defaultdict(list)
+    if reviews and comments_limit:
+        for comment in (
+            Comment.objects.filter(
+                review_id__in=[review['id'] for review in reviews]
+            )
+            .annotate(position=Window(
+                RowNumber(),
+                partition_by=F('review_id'),
+                order_by=F('id').asc(),
+            ))
+            .filter(position__lte=comments_limit)
+            .order_by('review_id', 'id')
+            .values('id', 'review_id', 'author_id', 'text', 'pub_date')
+        ):
+            comments[comment['review_id']].append(comment)
+    authors = dict(
+        UserProfile.objects.filter(id__in={
+            row['author_id']
+            for row in (
+                *reviews,
+                *(comment for rows in comments.values() for comment in rows),
+            )
+        }).values_list('id', 'username')
+    )
+    return {
+        **titles[0],
+        'reviews': [
+            {
+                'id': review['id'],
+                'author': authors[review['author_id']],
+                'text': review['text'],
+                'score': review['score'],
+                'pub_date': DATETIME_FIELD.to_representation(
+                    review['pub_date']
+                ),
+                'comment_count': review['comment_count'],
+                'comments': [
+                    {
+                        'id': comment['id'],
+                        'author': authors[comment['author_id']],
+                        'text': comment['text'],
+                        'pub_date': DATETIME_FIELD.to_representation(
+                            comment['pub_date']
+                        ),
+                    }
+                    for comment in comments[review['id']]
+                ],
+            }
+            for review in reviews
+        ],
+    }
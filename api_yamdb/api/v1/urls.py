@@ -3,12 +3,17 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     signup_view,
+    autocomplete_view,
+    batch_view,
+    moderate_reviews_view,
+    moderate_comments_view,
     TokenViewSet,
     UserViewSet,
     CategoryViewSet,
     GenreViewSet,
     TitleViewSet,
     ReviewViewSet,
+    ReviewSearchViewSet,
     CommentViewSet,
 )
 
@@ -29,10 +34,23 @@ router_v1.register(
     'comments',
 )
 router_v1.register('titles', TitleViewSet, 'titles')
+router_v1.register('reviews/search', ReviewSearchViewSet, 'reviews-search')
 
 
 urlpatterns = [
     path('auth/signup/', signup_view, name='signup'),
+    path('autocomplete/', autocomplete_view, name='autocomplete'),
+    path('batch/', batch_view, name='batch'),
+    path(
+        'moderation/reviews/delete/',
+        moderate_reviews_view,
+        name='moderation-reviews-delete',
+    ),
+    path(
+        'moderation/comments/delete/',
+        moderate_comments_view,
+        name='moderation-comments-delete',
+    ),
     path('auth/', include(router_v1_auth.urls)),
     path('', include(router_v1.urls)),
 ]
@@ -4,19 +4,40 @@ from rest_framework.viewsets import GenericViewSet, ModelViewSet
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import AccessToken
-from rest_framework.exceptions import ValidationError
-from rest_framework.filters import SearchFilter
-from rest_framework.mixins import CreateModelMixin
+from rest_framework.exceptions import (
+    NotFound,
+    PermissionDenied,
+    ValidationError,
+)
+from rest_framework.mixins import CreateModelMixin, ListModelMixin
 from django.core.mail import send_mail
 from django.contrib.auth.tokens import default_token_generator
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from django.conf import settings
-from django.db.models import Avg
-
-from reviews.models import UserProfile, Category, Genre, Title, Review
+from django.db import transaction
+from django.db.models import IntegerField
+from django.db.models.functions import Cast, Floor
+
+from reviews.aggregates import SCORES, score_statistics
+from reviews.bulk import (
+    bulk_delete_comments,
+    bulk_delete_reviews,
+    bulk_save_titles,
+)
+from reviews.search import fuzzy_title_search, title_facets
+from reviews.models import (
+    UserProfile,
+    Category,
+    Genre,
+    Title,
+    TitleScoreHistogram,
+    Review,
+    Comment,
+)
 from .permissions import (
     IsAdmin,
+    IsModerator,
     ReadOnly,
     IsAuthorOrModeratorOrReadOnly,
 )
@@ -28,12 +49,56 @@ from .serializers import (
     CategorySerializer,
     GenreSerializer,
     TitleGetSerializer,
+    TitleTopSerializer,
+    TopTitlesQuerySerializer,
+    TitleFuzzySerializer,
+    FuzzyTitlesQuerySerializer,
+    TitleListQuerySerializer,
+    TitleBulkItemSerializer,
+    TITLES_BULK_MAX_COUNT,
+    ReviewModerationSerializer,
+    CommentModerationSerializer,
+    BatchItemSerializer,
+    BatchQuerySerializer,
+    BATCH_MAX_REQUESTS,
+    TitlePageQuerySerializer,
+    TitleNormalizedSerializer,
+    FORMAT_MODE_NORMALIZED,
+    AutocompleteQuerySerializer,
     TitleWriteSerializer,
     ReviewSerializer,
+    ReviewSearchSerializer,
     CommentSerializer,
 )
-from .viewsets import CreateListDeleteViewSet
-from .filters import TitleFilter
+from .viewsets import (
+    ColumnarListMixin,
+    CreateListDeleteViewSet,
+    FastListMixin,
+    SparseFieldsetViewSetMixin,
+)
+from .fast_serializers import (
+    CategoryFastSerializer,
+    CommentFastSerializer,
+    GenreFastSerializer,
+    ReviewFastSerializer,
+    TitleFastSerializer,
+)
+from .filters import (
+    TITLE_IDS_MAX_COUNT,
+    TitleFilter,
+    FullTextSearchFilter,
+    NormalizedPrefixSearchFilter,
+    TitleOrderingFilter,
+)
+from .autocomplete import AUTOCOMPLETE_INDEXES
+from .title_index import title_bitmap_index
+from .title_page import title_page
+from .batch import execute_batch
+from .pagination import (
+    CachedCountPagination,
+    CursorOrCachedCountPagination,
+    CursorOrPageNumberPagination,
+)
 
 
 @api_view(['POST'])
@@ -64,6 +129,58 @@ def signup_view(request):
     )
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def autocomplete_view(request):
+    params = AutocompleteQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    kind = params.validated_data['kind']
+    if kind == 'user' and not (
+        request.user.is_authenticated and request.user.is_admin
+    ):
+        raise PermissionDenied('Поиск пользователей доступен администратору.')
+    return Response(AUTOCOMPLETE_INDEXES[kind].search(
+        params.validated_data['q'], params.validated_data['limit']
+    ))
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def batch_view(request):
+    params = BatchQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    items = BatchItemSerializer(
+        data=request.data,
+        many=True,
+        min_length=1,
+        max_length=BATCH_MAX_REQUESTS,
+    )
+    items.is_valid(raise_exception=True)
+    return Response(execute_batch(
+        request, items.validated_data, params.validated_data['concurrent']
+    ))
+
+
+@api_view(['POST'])
+@permission_classes([IsModerator])
+def moderate_reviews_view(request):
+    filters = ReviewModerationSerializer(data=request.data)
+    filters.is_valid(raise_exception=True)
+    return Response(
+        bulk_delete_reviews(filters.filter_queryset(Review.objects.all()))
+    )
+
+
+@api_view(['POST'])
+@permission_classes([IsModerator])
+def moderate_comments_view(request):
+    filters = CommentModerationSerializer(data=request.data)
+    filters.is_valid(raise_exception=True)
+    return Response(
+        bulk_delete_comments(filters.filter_queryset(Comment.objects.all()))
+    )
+
+
 class TokenViewSet(CreateModelMixin, GenericViewSet):
     serializer_class = TokenSerializer
     permission_classes = [AllowAny]
@@ -85,14 +202,37 @@ class TokenViewSet(CreateModelMixin, GenericViewSet):
         return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
-class UserViewSet(ModelViewSet):
-    queryset = UserProfile.objects.all().order_by('username')
+REVIEW_COLUMNS = {
+    'id': 'id',
+    'author': 'author__username',
+    'text': 'text',
+    'score': 'score',
+    'pub_date': 'pub_date',
+    'comment_count': 'comment_count',
+}
+
+
+class UserViewSet(
+    ColumnarListMixin, SparseFieldsetViewSetMixin, ModelViewSet
+):
+    queryset = UserProfile.objects.all().order_by('username_sort')
     serializer_class = UserSerializer
+    pagination_class = CursorOrPageNumberPagination
+    # Ключ сортировки уникален, как и логин, по которому он построен.
+    cursor_ordering = 'username_sort'
     permission_classes = [IsAdmin]
     lookup_field = 'username'
     http_method_names = ['get', 'post', 'patch', 'delete']
-    filter_backends = [SearchFilter]
-    search_fields = ['username']
+    filter_backends = [NormalizedPrefixSearchFilter]
+    search_fields = ['username_normalized']
+    columnar_fields = {
+        'username': 'username',
+        'email': 'email',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'bio': 'bio',
+        'role': 'role',
+    }
 
     @action(
         detail=False,
@@ -118,42 +258,226 @@ class UserViewSet(ModelViewSet):
 class CategoryViewSet(CreateListDeleteViewSet):
     queryset = Category.objects.all().order_by('id')
     serializer_class = CategorySerializer
-    filter_backends = (SearchFilter,)
+    fast_serializer_class = CategoryFastSerializer
+    pagination_class = CachedCountPagination
+    filter_backends = (NormalizedPrefixSearchFilter,)
     permission_classes = (IsAdmin | ReadOnly,)
-    search_fields = ('name',)
+    search_fields = ('name_normalized',)
     lookup_field = 'slug'
+    columnar_fields = {'name': 'name', 'slug': 'slug'}
 
 
 class GenreViewSet(CreateListDeleteViewSet):
     queryset = Genre.objects.all().order_by('id')
     serializer_class = GenreSerializer
-    filter_backends = (SearchFilter,)
+    fast_serializer_class = GenreFastSerializer
+    pagination_class = CachedCountPagination
+    filter_backends = (NormalizedPrefixSearchFilter,)
     permission_classes = (IsAdmin | ReadOnly,)
-    search_fields = ('name',)
+    search_fields = ('name_normalized',)
     lookup_field = 'slug'
+    columnar_fields = {'name': 'name', 'slug': 'slug'}
 
 
-class WithoutPutViewSet(ModelViewSet):
+class WithoutPutViewSet(
+    ColumnarListMixin, FastListMixin, SparseFieldsetViewSetMixin, ModelViewSet
+):
     http_method_names = ('get', 'head', 'options', 'post', 'delete', 'patch')
 
 
 class TitleViewSet(WithoutPutViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).order_by(
-        'id'
+    queryset = (
+        Title.objects.select_related('category')
+        .prefetch_related('genre')
+        .order_by('id')
     )
     permission_classes = (IsAdmin | ReadOnly,)
-    filter_backends = (DjangoFilterBackend, SearchFilter)
+    pagination_class = CursorOrCachedCountPagination
+    filter_backends = (
+        DjangoFilterBackend, FullTextSearchFilter, TitleOrderingFilter
+    )
     filterset_class = TitleFilter
+    columnar_fields = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'description': 'description',
+        'genre': 'genre__slug',
+        'category': 'category__slug',
+        # Как IntegerField сериализатора: рейтинг без дробной части.
+        'rating': Cast(Floor('rating'), IntegerField()),
+        'review_count': 'rating_count',
+    }
+    columnar_many_fields = ('genre',)
+    fast_serializer_class = TitleFastSerializer
 
     def get_serializer_class(self):
+        if self.action == 'list' and self.request.query_params.get(
+            'format_mode'
+        ) == FORMAT_MODE_NORMALIZED:
+            return TitleNormalizedSerializer
         if self.action in ('list', 'retrieve'):
             return TitleGetSerializer
         return TitleWriteSerializer
 
+    def title_id(self):
+        """id произведения из адреса; нечисловой id — 404, как у retrieve."""
+        try:
+            return int(self.kwargs['pk'])
+        except ValueError:
+            raise NotFound
+
+    def fast_list_allowed(self):
+        return super().fast_list_allowed() and self.request.query_params.get(
+            'format_mode'
+        ) != FORMAT_MODE_NORMALIZED
+
+    def list(self, request, *args, **kwargs):
+        params = TitleListQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        ids = title_bitmap_index.match(request.query_params)
+        if ids is None:
+            response = super().list(request, *args, **kwargs)
+        else:
+            response = self.list_ids(ids)
+        if params.validated_data.get('facets'):
+            response.data['facets'] = title_facets(
+                self.filter_queryset(self.get_queryset()),
+                params.validated_data['facets'],
+            )
+        if params.validated_data['format_mode'] == FORMAT_MODE_NORMALIZED:
+            response.data['included'] = self.included(
+                response.data['results'].serializer
+            )
+        return response
+
+    @staticmethod
+    def included(serializer):
+        """Категории и жанры страницы, каждый объект по одному разу.
+
+        Объекты берутся из уже загруженных произведений страницы, поэтому
+        дополнительных запросов к базе нет.
+        """
+        titles = serializer.instance
+        fields = serializer.child.fields
+        included = {}
+        if 'category' in fields:
+            categories = {
+                title.category.slug: title.category
+                for title in titles if title.category is not None
+            }
+            included['categories'] = CategorySerializer(
+                categories.values(), many=True
+            ).data
+        if 'genre' in fields:
+            genres = {
+                genre.slug: genre
+                for title in titles for genre in title.genre.all()
+            }
+            included['genres'] = GenreSerializer(
+                genres.values(), many=True
+            ).data
+        return included
+
+    def paginate_queryset(self, queryset):
+        if self.request.query_params.get('ids', '').strip(', '):
+            # Все произведения из ?ids= помещаются на одну страницу.
+            self.paginator.page_size = TITLE_IDS_MAX_COUNT
+        return super().paginate_queryset(queryset)
+
+    def list_ids(self, ids):
+        """Страница списка по готовому упорядоченному набору id."""
+        page_ids = self.paginate_queryset(ids)
+        titles = self.sparse_queryset(self.get_queryset()).filter(
+            id__in=page_ids
+        )
+        if self.fast_list_allowed():
+            fast_serializer = self.fast_serializer_class()
+            return self.get_paginated_response(
+                fast_serializer.serialize(fast_serializer.rows(titles))
+            )
+        return self.get_paginated_response(
+            self.get_serializer(titles, many=True).data
+        )
+
+    @action(detail=False, methods=['get'], url_path='top')
+    def top(self, request):
+        params = TopTitlesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        # Без отзывов взвешенный рейтинг равен априорному среднему и
+        # поднял бы произведение выше оцененных ниже среднего.
+        queryset = Title.objects.filter(rating_count__gt=0).select_related(
+            'category'
+        ).prefetch_related('genre')
+        if 'category' in params.validated_data:
+            queryset = queryset.filter(
+                category__slug=params.validated_data['category']
+            )
+        if 'genre' in params.validated_data:
+            queryset = queryset.filter(
+                genre__slug=params.validated_data['genre']
+            )
+        queryset = queryset.order_by('-weighted_rating', '-id')
+        return Response(TitleTopSerializer(
+            queryset[:params.validated_data['limit']], many=True
+        ).data)
+
+    @action(detail=False, methods=['get'], url_path='fuzzy')
+    def fuzzy(self, request):
+        params = FuzzyTitlesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        titles = fuzzy_title_search(
+            params.validated_data['q'], params.validated_data['limit']
+        )
+        return Response(TitleFuzzySerializer(titles, many=True).data)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        serializer = TitleBulkItemSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=TITLES_BULK_MAX_COUNT,
+        )
+        serializer.is_valid(raise_exception=True)
+        created, updated = bulk_save_titles(serializer.validated_data)
+        return Response(
+            {'created': created, 'updated': updated},
+            status=(
+                status.HTTP_201_CREATED if created else status.HTTP_200_OK
+            ),
+        )
+
+    @action(detail=True, methods=['get'], url_path='page')
+    def page(self, request, pk=None):
+        params = TitlePageQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(title_page(
+            self.title_id(),
+            params.validated_data['reviews'],
+            params.validated_data['comments_per_review'],
+        ))
+
+    @action(detail=True, methods=['get'], url_path='stats')
+    def stats(self, request, pk=None):
+        histogram = TitleScoreHistogram.objects.filter(
+            title_id=self.title_id()
+        ).first()
+        if histogram is None:
+            raise NotFound
+        buckets = histogram.buckets
+        return Response({
+            **score_statistics(buckets),
+            'histogram': dict(zip(SCORES, buckets)),
+        })
+
 
 class ReviewViewSet(WithoutPutViewSet):
     serializer_class = ReviewSerializer
+    fast_serializer_class = ReviewFastSerializer
     permission_classes = (IsAuthorOrModeratorOrReadOnly,)
+    pagination_class = CursorOrCachedCountPagination
+    columnar_fields = REVIEW_COLUMNS
 
     def get_title(self):
         return get_object_or_404(Title, id=self.kwargs['title_id'])
@@ -161,13 +485,51 @@ class ReviewViewSet(WithoutPutViewSet):
     def get_queryset(self):
         return self.get_title().reviews.all().order_by('id')
 
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_title())
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # Оценка, от которой считается сдвиг рейтинга, перечитывается под
+        # блокировкой: get_object() загрузил ее до начала транзакции, и
+        # параллельные изменения сдвинули бы рейтинг от одной оценки.
+        serializer.instance._loaded_score = (
+            Review.objects.select_for_update()
+            .values_list('score', flat=True)
+            .get(pk=serializer.instance.pk)
+        )
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+
+class ReviewSearchViewSet(
+    ColumnarListMixin,
+    SparseFieldsetViewSetMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
+    queryset = Review.objects.select_related('author').order_by('id')
+    serializer_class = ReviewSearchSerializer
+    permission_classes = (IsAdmin,)
+    columnar_fields = {**REVIEW_COLUMNS, 'title': 'title'}
+    filter_backends = (FullTextSearchFilter,)
+
 
 class CommentViewSet(WithoutPutViewSet):
     serializer_class = CommentSerializer
+    fast_serializer_class = CommentFastSerializer
     permission_classes = (IsAuthorOrModeratorOrReadOnly,)
+    pagination_class = CursorOrPageNumberPagination
+    columnar_fields = {
+        'id': 'id',
+        'author': 'author__username',
+        'text': 'text',
+        'pub_date': 'pub_date',
+    }
 
     def get_review(self):
         return get_object_or_404(
@@ -177,5 +539,10 @@ class CommentViewSet(WithoutPutViewSet):
     def get_queryset(self):
         return self.get_review().comments.all().order_by('id')
 
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
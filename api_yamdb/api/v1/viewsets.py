@@ -1,3 +1,8 @@
+from collections import defaultdict
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import (
     CreateModelMixin,
@@ -5,8 +10,180 @@ from rest_framework.mixins import (
     DestroyModelMixin,
 )
 
+from .serializers import (
+    LAYOUT_COLUMNAR,
+    SPARSE_FIELDS_PARAM,
+    SPARSE_OMIT_PARAM,
+    ListLayoutQuerySerializer,
+    sparse_fieldset,
+)
+
+
+def prune_queryset(queryset, fields, keep=()):
+    """Убирает из запроса то, что не нужно для полей ответа fields.
+
+    Неиспользуемые столбцы откладываются через defer(), а связи, которые
+    не попали в ответ, исключаются из select_related и prefetch_related.
+    Поля с source='*' читают весь объект, с ними запрос не меняется.
+    """
+    sources = {field.source.split('.')[0] for field in fields} | set(keep)
+    if '*' in sources:
+        return queryset
+    deferred = [
+        field.name for field in queryset.model._meta.concrete_fields
+        if not (field.primary_key or field.is_relation)
+        and field.name not in sources
+    ]
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        queryset = queryset.select_related(None).select_related(
+            *(name for name in select_related if name in sources)
+        )
+    prefetches = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if getattr(lookup, 'prefetch_through', lookup).split('__')[0]
+        in sources
+    ]
+    return (
+        queryset.prefetch_related(None)
+        .prefetch_related(*prefetches)
+        .defer(*deferred)
+    )
+
+
+class SparseFieldsetViewSetMixin:
+    """Запрос к БД под поля ответа, выбранные ?fields= и ?omit=.
+
+    Урезание встроено в filter_queryset(), через который проходят list и
+    retrieve, поэтому представлениям со своим get_queryset() ничего
+    менять не нужно.
+    """
+
+    def filter_queryset(self, queryset):
+        return self.sparse_queryset(super().filter_queryset(queryset))
+
+    def sparse_queryset(self, queryset):
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or not (
+            SPARSE_FIELDS_PARAM in params or SPARSE_OMIT_PARAM in params
+        ):
+            return queryset
+        # Поле курсора читается у записей страницы, его не откладываем.
+        keep = [getattr(self, 'cursor_ordering', 'id').lstrip('-')]
+        return prune_queryset(
+            queryset, self.get_serializer().fields.values(), keep
+        )
+
+
+class ColumnarListMixin:
+    """Ответ списка ?layout=columnar: массив значений на каждое поле.
+
+    Строки страницы читаются через values_list() без создания объектов
+    модели и полей сериализатора. Поля ответа и пути к ним задает
+    columnar_fields, значением может быть и выражение. Поля из
+    columnar_many_fields имеют по нескольку значений на запись
+    (ManyToMany) и читаются одним дополнительным запросом на страницу.
+    """
+
+    columnar_fields = None
+    columnar_many_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        params = ListLayoutQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        if params.validated_data['layout'] != LAYOUT_COLUMNAR:
+            return super().list(request, *args, **kwargs)
+        if not self.columnar_fields:
+            raise ValidationError({'layout': [
+                'Этот список не поддерживает layout=columnar.'
+            ]})
+        return self.columnar_list(self.filter_queryset(self.get_queryset()))
+
+    def columnar_list(self, queryset):
+        names = sparse_fieldset(
+            self.request.query_params, list(self.columnar_fields)
+        )
+        fields = [
+            name for name in names if name not in self.columnar_many_fields
+        ]
+        aliases = {
+            name: f'columnar_{name}' for name in fields
+            if not isinstance(self.columnar_fields[name], str)
+        }
+        columns = [
+            aliases.get(name, self.columnar_fields[name]) for name in fields
+        ]
+        # Курсорная пагинация читает поле сортировки у записей страницы.
+        cursor_field = getattr(self, 'cursor_ordering', 'id').lstrip('-')
+        query_columns = list(dict.fromkeys(('pk', cursor_field, *columns)))
+        rows = (
+            queryset.prefetch_related(None)
+            .annotate(**{
+                alias: self.columnar_fields[name]
+                for name, alias in aliases.items()
+            })
+            .values_list(*query_columns, named=True)
+        )
+        page = list(self.paginate_queryset(rows))
+        data = {}
+        for name, column in zip(fields, columns):
+            index = query_columns.index(column)
+            data[name] = [row[index] for row in page]
+        ids = [row[0] for row in page]
+        for name in names:
+            if name in self.columnar_many_fields:
+                path = self.columnar_fields[name]
+                values = defaultdict(list)
+                for pk, value in (
+                    queryset.model.objects.filter(pk__in=ids)
+                    .exclude(**{f'{path}__isnull': True})
+                    .values_list('pk', path)
+                    .order_by('pk', path)
+                ):
+                    values[pk].append(value)
+                data[name] = [values[pk] for pk in ids]
+        return self.get_paginated_response(
+            {name: data[name] for name in names}
+        )
+
+
+class FastListMixin:
+    """Список через быстрый сериализатор fast_serializer_class.
+
+    Быстрый путь включается настройкой FAST_READ_SERIALIZERS_ENABLED и
+    используется, когда ответ совпадает с ответом обычного сериализатора:
+    без ?fields= и ?omit= и других режимов, для которых представление
+    возвращает False из fast_list_allowed().
+    """
+
+    fast_serializer_class = None
+
+    def fast_list_allowed(self):
+        params = self.request.query_params
+        return (
+            self.fast_serializer_class is not None
+            and getattr(settings, 'FAST_READ_SERIALIZERS_ENABLED', False)
+            and SPARSE_FIELDS_PARAM not in params
+            and SPARSE_OMIT_PARAM not in params
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list_allowed():
+            return super().list(request, *args, **kwargs)
+        fast_serializer = self.fast_serializer_class()
+        page = self.paginate_queryset(
+            fast_serializer.rows(self.filter_queryset(self.get_queryset()))
+        )
+        return self.get_paginated_response(fast_serializer.serialize(page))
+
 
 class CreateListDeleteViewSet(
-    GenericViewSet, CreateModelMixin, ListModelMixin, DestroyModelMixin
+    ColumnarListMixin,
+    FastListMixin,
+    SparseFieldsetViewSetMixin,
+    GenericViewSet,
+    CreateModelMixin,
+    ListModelMixin,
+    DestroyModelMixin,
 ):
     pass
@@ -78,6 +78,35 @@ DATABASES = {
 }
 
 
+# Cache
+# Количества объектов в пагинации кешируются и сбрасываются при записи.
+# При нескольких процессах кеш должен быть общим (Redis, Memcached),
+# иначе процесс увидит запись другого процесса только по истечении таймаута.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Индекс произведений в памяти процесса для фильтров по жанру, категории
+# и году. Записи других процессов видны после перестроения индекса.
+
+TITLE_BITMAP_INDEX_ENABLED = False
+
+TITLE_BITMAP_INDEX_MAX_AGE = 60
+
+# Индексы автодополнения в памяти процесса перестраиваются после записи
+# этим процессом или не реже чем раз в AUTOCOMPLETE_INDEX_MAX_AGE секунд.
+
+AUTOCOMPLETE_INDEX_MAX_AGE = 60
+
+# Списки без ?fields= и особых режимов сериализуются напрямую из строк
+# values_list(), минуя поля DRF. Ответ совпадает с обычным байт в байт.
+
+FAST_READ_SERIALIZERS_ENABLED = True
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -0,0 +1,255 @@
+from math import sqrt
+
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
+
+from .models import (
+    Title,
+    TitleScoreHistogram,
+    Review,
+    SCORE_MIN_VALUE,
+    SCORE_MAX_VALUE,
+    RATING_PRIOR_MEAN,
+    RATING_PRIOR_WEIGHT,
+)
+
+
+SCORES = range(SCORE_MIN_VALUE, SCORE_MAX_VALUE + 1)
+
+
+def rating_expression(rating_sum, rating_count):
+    """Рейтинг как частное суммы и количества оценок, NULL без оценок."""
+    return Case(
+        When(
+            GreaterThan(rating_count, 0),
+            then=Cast(rating_sum, FloatField()) / rating_count,
+        ),
+        default=None,
+        output_field=FloatField(),
+    )
+
+
+def weighted_rating_expression(rating_sum, rating_count):
+    """Байесовский рейтинг, сглаженный априорными оценками."""
+    return (
+        Cast(rating_sum, FloatField())
+        + RATING_PRIOR_MEAN * RATING_PRIOR_WEIGHT
+    ) / (rating_count + RATING_PRIOR_WEIGHT)
+
+
+def weighted_rating(rating_sum, rating_count):
+    """Байесовский рейтинг для уже известных суммы и количества оценок."""
+    return (
+        (rating_sum + RATING_PRIOR_MEAN * RATING_PRIOR_WEIGHT)
+        / (rating_count + RATING_PRIOR_WEIGHT)
+    )
+
+
+def shift_title_rating(title_id, score_delta, count_delta):
+    """Сдвигает сумму и количество оценок произведения одним UPDATE."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+        rating=rating_expression(
+            F('rating_sum') + score_delta, F('rating_count') + count_delta
+        ),
+        weighted_rating=weighted_rating_expression(
+            F('rating_sum') + score_delta, F('rating_count') + count_delta
+        ),
+    )
+
+
+def shift_score_histogram(title_id, bucket_deltas):
+    """Сдвигает счетчики оценок произведения одним UPDATE."""
+    changes = {
+        TitleScoreHistogram.bucket_field(score): (
+            F(TitleScoreHistogram.bucket_field(score)) + delta
+        )
+        for score, delta in bucket_deltas.items()
+        if delta
+    }
+    if not changes:
+        return
+    if not TitleScoreHistogram.objects.filter(title_id=title_id).update(
+        **changes
+    ):
+        rebuild_title_scores(title_id)
+
+
+def apply_review_change(title_id, old_score=None, new_score=None):
+    """Учитывает создание, изменение оценки или удаление отзыва."""
+    bucket_deltas = dict.fromkeys(SCORES, 0)
+    score_delta = count_delta = 0
+    if old_score is not None:
+        bucket_deltas[old_score] -= 1
+        score_delta -= old_score
+        count_delta -= 1
+    if new_score is not None:
+        bucket_deltas[new_score] += 1
+        score_delta += new_score
+        count_delta += 1
+    if score_delta or count_delta:
+        shift_title_rating(title_id, score_delta, count_delta)
+    shift_score_histogram(title_id, bucket_deltas)
+
+
+def shift_comment_count(review_id, delta):
+    """Сдвигает счетчик комментариев отзыва одним UPDATE."""
+    Review.objects.filter(pk=review_id).update(
+        comment_count=F('comment_count') + delta
+    )
+
+
+def delta_by_row(key, deltas):
+    """CASE со сдвигом для каждой записи, 0 для остальных."""
+    return Case(
+        *(
+            When(**{key: pk}, then=Value(delta))
+            for pk, delta in deltas.items()
+        ),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def shift_comment_counts(review_deltas):
+    """Сдвигает счетчики комментариев набора отзывов одним UPDATE."""
+    if not review_deltas:
+        return
+    Review.objects.filter(pk__in=review_deltas).update(
+        comment_count=F('comment_count') + delta_by_row('pk', review_deltas)
+    )
+
+
+def shift_titles_scores(title_deltas):
+    """Сдвигает рейтинги и распределения оценок набора произведений.
+
+    title_deltas сопоставляет id произведения сдвиги счетчиков по
+    оценкам. Рейтинги и распределения обновляются двумя UPDATE на весь
+    набор; отсутствующие распределения пересчитываются по отзывам.
+    """
+    if not title_deltas:
+        return
+    score_delta = delta_by_row('pk', {
+        title_id: sum(score * delta for score, delta in deltas.items())
+        for title_id, deltas in title_deltas.items()
+    })
+    count_delta = delta_by_row('pk', {
+        title_id: sum(deltas.values())
+        for title_id, deltas in title_deltas.items()
+    })
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    Title.objects.filter(pk__in=title_deltas).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=rating_expression(rating_sum, rating_count),
+        weighted_rating=weighted_rating_expression(rating_sum, rating_count),
+    )
+    changes = {}
+    for score in SCORES:
+        deltas = {
+            title_id: title_deltas[title_id][score]
+            for title_id in title_deltas
+            if title_deltas[title_id].get(score)
+        }
+        if deltas:
+            field = TitleScoreHistogram.bucket_field(score)
+            changes[field] = F(field) + delta_by_row('title_id', deltas)
+    if not changes:
+        return
+    histograms = TitleScoreHistogram.objects.filter(title_id__in=title_deltas)
+    if histograms.update(**changes) < len(title_deltas):
+        for title_id in set(title_deltas) - set(
+            histograms.values_list('title_id', flat=True)
+        ):
+            rebuild_title_scores(title_id)
+
+
+def actual_title_scores(title_ids):
+    """Распределения оценок набора произведений одним запросом."""
+    buckets = {
+        TitleScoreHistogram.bucket_field(score): Count(
+            'id', filter=Q(score=score)
+        )
+        for score in SCORES
+    }
+    rows = (
+        Review.objects.filter(title_id__in=title_ids)
+        .values('title_id')
+        .annotate(**buckets)
+        .order_by()
+    )
+    return {
+        row['title_id']: [row[field] for field in buckets] for row in rows
+    }
+
+
+def rating_totals(buckets):
+    """Сумма и количество оценок по счетчикам распределения."""
+    return (
+        sum(score * count for score, count in zip(SCORES, buckets)),
+        sum(buckets),
+    )
+
+
+def rebuild_title_scores(title_id):
+    """Пересчитывает рейтинг и распределение оценок по отзывам."""
+    buckets = actual_title_scores([title_id]).get(
+        title_id, [0] * len(SCORES)
+    )
+    rating_sum, rating_count = rating_totals(buckets)
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=rating_sum / rating_count if rating_count else None,
+        weighted_rating=weighted_rating(rating_sum, rating_count),
+    )
+    TitleScoreHistogram.objects.update_or_create(
+        title_id=title_id,
+        defaults={
+            TitleScoreHistogram.bucket_field(score): count
+            for score, count in zip(SCORES, buckets)
+        },
+    )
+
+
+def score_statistics(buckets):
+    """Количество, среднее, медиана и стандартное отклонение оценок."""
+    count = sum(buckets)
+    if not count:
+        return {'count': 0, 'mean': None, 'median': None, 'std_dev': None}
+    rating_sum, _ = rating_totals(buckets)
+    mean = rating_sum / count
+    variance = sum(
+        bucket * (score - mean) ** 2 for score, bucket in zip(SCORES, buckets)
+    ) / count
+    return {
+        'count': count,
+        'mean': mean,
+        'median': (
+            _score_at(buckets, (count - 1) // 2)
+            + _score_at(buckets, count // 2)
+        ) / 2,
+        'std_dev': sqrt(variance),
+    }
+
+
+def _score_at(buckets, position):
+    """Оценка, стоящая на позиции position в упорядоченном ряду оценок."""
+    seen = 0
+    for score, bucket in zip(SCORES, buckets):
+        seen += bucket
+        if position < seen:
+            return score
+    raise IndexError(position)
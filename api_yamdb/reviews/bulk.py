@@ -0,0 +1,183 @@
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Count
+
+from .aggregates import shift_comment_counts, shift_titles_scores
+from .models import Title, TitleScoreHistogram, TitleTrigram, Review, Comment
+from .signals import bulk_deleted, titles_bulk_saved
+from .text import sort_key, trigrams
+
+
+BULK_BATCH_SIZE = 1000
+TITLE_BULK_FIELDS = ('name', 'name_sort', 'year', 'description', 'category')
+
+
+def build_title(row):
+    return Title(
+        id=row.get('id'),
+        name=row['name'],
+        name_sort=sort_key(row['name']),
+        year=row['year'],
+        description=row.get('description', ''),
+        category_id=row['category_id'],
+    )
+
+
+def bulk_save_titles(rows):
+    """Создает и обновляет произведения пакетами в одной транзакции.
+
+    Строки без id создаются, строки с id заменяют произведение целиком,
+    включая список жанров. bulk_create и bulk_update обходят save() и
+    post_save, поэтому ключ сортировки, распределения оценок новых
+    произведений, триграммы и связи с жанрами пишутся здесь же пакетно,
+    а кэшам об изменении сообщает сигнал titles_bulk_saved.
+    Возвращает списки id созданных и обновленных произведений.
+    """
+    new_rows = [row for row in rows if row.get('id') is None]
+    changed_rows = [row for row in rows if row.get('id') is not None]
+    with transaction.atomic():
+        created = Title.objects.bulk_create(
+            [build_title(row) for row in new_rows],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        updated = [build_title(row) for row in changed_rows]
+        old_names = dict(
+            Title.objects.filter(
+                id__in=[title.id for title in updated]
+            ).values_list('id', 'name')
+        )
+        Title.objects.bulk_update(
+            updated, TITLE_BULK_FIELDS, batch_size=BULK_BATCH_SIZE
+        )
+        TitleScoreHistogram.objects.bulk_create(
+            [TitleScoreHistogram(title_id=title.id) for title in created],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+        renamed = [
+            title for title in updated if old_names[title.id] != title.name
+        ]
+        TitleTrigram.objects.filter(
+            title_id__in=[title.id for title in renamed]
+        ).delete()
+        TitleTrigram.objects.bulk_create(
+            (
+                TitleTrigram(title_id=title.id, trigram=trigram)
+                for title in (*created, *renamed)
+                for trigram in trigrams(title.name)
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+        links = Title.genre.through
+        links.objects.filter(
+            title_id__in=[title.id for title in updated]
+        ).delete()
+        links.objects.bulk_create(
+            (
+                links(title_id=title.id, genre_id=genre_id)
+                for title, row in zip(
+                    (*created, *updated), (*new_rows, *changed_rows)
+                )
+                for genre_id in dict.fromkeys(row['genre_ids'])
+            ),
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+        created_ids = [title.id for title in created]
+        updated_ids = [title.id for title in updated]
+        titles_bulk_saved.send(
+            sender=Title, created_ids=created_ids, updated_ids=updated_ids
+        )
+    return created_ids, updated_ids
+
+
+def id_batches(queryset):
+    """id записей выборки порциями по BULK_BATCH_SIZE в порядке id."""
+    ids = list(queryset.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), BULK_BATCH_SIZE):
+        yield ids[start:start + BULK_BATCH_SIZE]
+
+
+def delete_by(model, field, values):
+    """DELETE записей, у которых field из values, одним запросом.
+
+    QuerySet.delete() загружает объекты и отправляет post_delete на каждую
+    запись, поэтому запрос составляется по метаданным модели.
+    """
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} '
+            f'WHERE {quote(model._meta.get_field(field).column)} '
+            f'IN ({", ".join(["%s"] * len(values))})',
+            list(values),
+        )
+        return cursor.rowcount
+
+
+def bulk_delete_reviews(queryset):
+    """Удаляет отзывы выборки вместе с комментариями порциями.
+
+    Каждая порция удаляется в своей транзакции двумя DELETE. Рейтинги и
+    распределения оценок затронутых произведений сдвигаются на оценки
+    удаленных отзывов, сгруппированные одним запросом, двумя UPDATE на
+    порцию, без post_delete на каждую запись.
+    Возвращает количество удаленных записей и id затронутых произведений.
+    """
+    deleted = Counter()
+    title_ids = set()
+    for ids in id_batches(queryset):
+        with transaction.atomic():
+            reviews = Review.objects.filter(id__in=ids)
+            title_scores = defaultdict(dict)
+            for row in (
+                reviews.values('title_id', 'score')
+                .annotate(count=Count('id'))
+                .order_by()
+            ):
+                title_scores[row['title_id']][row['score']] = row['count']
+            deleted['comments'] += delete_by(Comment, 'review', ids)
+            deleted['reviews'] += delete_by(Review, 'id', ids)
+            shift_titles_scores({
+                title_id: {score: -count for score, count in scores.items()}
+                for title_id, scores in title_scores.items()
+            })
+            title_ids.update(title_scores)
+            bulk_deleted.send(sender=Comment)
+            bulk_deleted.send(sender=Review)
+    return {
+        'deleted': {
+            'reviews': deleted['reviews'], 'comments': deleted['comments']
+        },
+        'titles': sorted(title_ids),
+    }
+
+
+def bulk_delete_comments(queryset):
+    """Удаляет комментарии выборки порциями.
+
+    Счетчики комментариев отзывов уменьшаются на количество удаленных
+    комментариев одним UPDATE на порцию.
+    Возвращает количество удаленных записей и id затронутых отзывов.
+    """
+    deleted = 0
+    review_ids = set()
+    for ids in id_batches(queryset):
+        with transaction.atomic():
+            comments = Comment.objects.filter(id__in=ids)
+            review_counts = dict(
+                comments.values('review_id')
+                .annotate(count=Count('id'))
+                .values_list('review_id', 'count')
+                .order_by()
+            )
+            deleted += delete_by(Comment, 'id', ids)
+            shift_comment_counts({
+                review_id: -count
+                for review_id, count in review_counts.items()
+            })
+            review_ids.update(review_counts)
+            bulk_deleted.send(sender=Comment)
+    return {'deleted': {'comments': deleted}, 'reviews': sorted(review_ids)}
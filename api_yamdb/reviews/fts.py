@@ -0,0 +1,77 @@
+"""SQL полнотекстовых индексов FTS5 для SQLite.
+
+Индексы внешние: таблица FTS5 без собственного содержимого заполняется
+триггерами исходной таблицы. SQLite пересоздает таблицу при большинстве
+изменений схемы и теряет ее триггеры, поэтому миграции, меняющие
+проиндексированные таблицы, восстанавливают их через restore_triggers().
+"""
+from django.db import migrations
+
+
+SEARCH_INDEXES = {
+    'reviews_title': ('name', 'description'),
+    'reviews_review': ('text',),
+}
+
+
+def fold(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def trigger_sql(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new_values = ', '.join(fold(f'new.{column}') for column in columns)
+    old_values = ', '.join(fold(f'old.{column}') for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});'
+    )
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert_new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete_old} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_update '
+        f'AFTER UPDATE OF {names} ON {table} '
+        f'BEGIN {delete_old} {insert_new} END',
+    ]
+
+
+def index_sql(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    return [
+        f'CREATE VIRTUAL TABLE {fts} USING fts5({names}, content=\'\', '
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f'INSERT INTO {fts}(rowid, {names}) '
+        f'SELECT id, {", ".join(fold(column) for column in columns)} '
+        f'FROM {table}',
+        *trigger_sql(table, columns),
+    ]
+
+
+def drop_sql(table):
+    fts = f'{table}_fts'
+    return [
+        f'DROP TRIGGER IF EXISTS {fts}_insert',
+        f'DROP TRIGGER IF EXISTS {fts}_delete',
+        f'DROP TRIGGER IF EXISTS {fts}_update',
+        f'DROP TABLE IF EXISTS {fts}',
+    ]
+
+
+def restore_triggers(*tables):
+    """Операция миграции, возвращающая триггеры индексов таблиц tables."""
+
+    def restore(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for table in tables:
+            for sql in trigger_sql(table, SEARCH_INDEXES[table]):
+                schema_editor.execute(sql)
+
+    return migrations.RunPython(restore, migrations.RunPython.noop)
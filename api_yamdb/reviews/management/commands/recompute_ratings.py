@@ -0,0 +1,148 @@
+import time
+from math import isclose
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.aggregates import (
+    SCORES,
+    actual_title_scores,
+    rating_totals,
+    weighted_rating,
+)
+from reviews.models import Title, TitleScoreHistogram
+
+
+BUCKET_FIELDS = [TitleScoreHistogram.bucket_field(score) for score in SCORES]
+
+
+class Command(BaseCommand):
+    help = 'Rebuild aggregated title ratings and score histograms'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of titles processed in one transaction',
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only report titles whose stored rating has drifted',
+        )
+
+    def handle(self, *args, chunk_size, verify, **kwargs):
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be positive')
+        total = Title.objects.count()
+        started = time.monotonic()
+        last_id = 0
+        titles_done = reviews_done = drifted = 0
+        while True:
+            with transaction.atomic():
+                chunk = self.fetch_chunk(last_id, chunk_size, verify)
+                if not chunk:
+                    break
+                last_id = chunk[-1].id
+                actual = actual_title_scores([title.id for title in chunk])
+                stale = self.find_stale(chunk, actual, verify)
+                if not verify:
+                    self.save_stale(stale, actual)
+            titles_done += len(chunk)
+            reviews_done += sum(map(sum, actual.values()))
+            drifted += len(stale)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{titles_done}/{total} titles, {reviews_done} reviews, '
+                f'{reviews_done / elapsed if elapsed else 0:.0f} rows/s'
+            )
+
+        if verify and drifted:
+            raise CommandError(f'Found {drifted} titles with drifted rating')
+        action = 'verified' if verify else 'rebuilt'
+        self.stdout.write(self.style.SUCCESS(
+            f'Ratings {action}: {titles_done} titles, '
+            f'{drifted} out of date'
+        ))
+
+    def fetch_chunk(self, last_id, chunk_size, verify):
+        queryset = Title.objects.filter(id__gt=last_id)
+        if not verify:
+            # Блокировка строк не дает сигналам отзывов сдвинуть рейтинг
+            # между подсчетом и записью, остальные произведения доступны.
+            queryset = queryset.select_for_update(of=('self',))
+        return list(
+            queryset.select_related('score_histogram')
+            .only(
+                'id',
+                'rating_sum',
+                'rating_count',
+                'rating',
+                'weighted_rating',
+                *(f'score_histogram__{field}' for field in BUCKET_FIELDS),
+            )
+            .order_by('id')[:chunk_size]
+        )
+
+    def find_stale(self, chunk, actual, verify):
+        stale = []
+        for title in chunk:
+            buckets = actual.get(title.id, [0] * len(SCORES))
+            stored = self.stored_buckets(title)
+            totals = rating_totals(buckets)
+            if (
+                (title.rating_sum, title.rating_count) == totals
+                and self.rating_matches(title.rating, *totals)
+                and isclose(title.weighted_rating, weighted_rating(*totals))
+                and stored == buckets
+            ):
+                continue
+            if verify:
+                self.stdout.write(self.style.WARNING(
+                    f'Title {title.id}: stored {title.rating_sum}/'
+                    f'{title.rating_count}={title.rating} {stored}, actual '
+                    f'{totals[0]}/{totals[1]} {buckets}'
+                ))
+            stale.append(title)
+        return stale
+
+    def rating_matches(self, rating, rating_sum, rating_count):
+        if not rating_count:
+            return rating is None
+        return rating is not None and isclose(
+            rating, rating_sum / rating_count
+        )
+
+    def stored_buckets(self, title):
+        try:
+            return title.score_histogram.buckets
+        except TitleScoreHistogram.DoesNotExist:
+            return None
+
+    def save_stale(self, stale, actual):
+        histograms = []
+        for title in stale:
+            buckets = actual.get(title.id, [0] * len(SCORES))
+            title.rating_sum, title.rating_count = rating_totals(buckets)
+            title.rating = (
+                title.rating_sum / title.rating_count
+                if title.rating_count else None
+            )
+            title.weighted_rating = weighted_rating(
+                title.rating_sum, title.rating_count
+            )
+            histograms.append(TitleScoreHistogram(
+                title_id=title.id,
+                **dict(zip(BUCKET_FIELDS, buckets)),
+            ))
+        Title.objects.bulk_update(
+            stale,
+            ('rating_sum', 'rating_count', 'rating', 'weighted_rating'),
+        )
+        TitleScoreHistogram.objects.bulk_create(
+            histograms,
+            update_conflicts=True,
+            unique_fields=('title',),
+            update_fields=BUCKET_FIELDS,
+        )
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:03
+
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+
+PRIOR_MEAN = 5.5
+PRIOR_WEIGHT = 10
+
+
+def fill_weighted_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(
+        weighted_rating=(
+            Cast('rating_sum', FloatField()) + PRIOR_MEAN * PRIOR_WEIGHT
+        ) / (F('rating_count') + PRIOR_WEIGHT)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_score_histogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(default=5.5, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['weighted_rating', 'id'], name='title_weighted_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'weighted_rating', 'id'], name='title_cat_weighted_rating_idx'),
+        ),
+        migrations.RunPython(
+            fill_weighted_ratings, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-17 07:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from reviews.text import trigrams
+
+
+def fill_trigrams(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TitleTrigram = apps.get_model('reviews', 'TitleTrigram')
+    TitleTrigram.objects.bulk_create(
+        (
+            TitleTrigram(title_id=title_id, trigram=trigram)
+            for title_id, name in Title.objects.values_list('id', 'name')
+            for trigram in trigrams(name)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_full_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3, verbose_name='Триграмма')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='reviews.title')),
+            ],
+            options={
+                'verbose_name': 'Триграмма названия',
+                'verbose_name_plural': 'Триграммы названий',
+                'constraints': [models.UniqueConstraint(fields=('trigram', 'title'), name='unique_title_trigram')],
+            },
+        ),
+        migrations.RunPython(fill_trigrams, migrations.RunPython.noop),
+    ]
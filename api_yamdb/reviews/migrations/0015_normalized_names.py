@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-17 08:40
+
+from django.db import migrations, models
+
+from reviews.text import normalize
+
+
+def fill_normalized_names(apps, schema_editor):
+    for model_name, source, target in (
+        ('UserProfile', 'username', 'username_normalized'),
+        ('Category', 'name', 'name_normalized'),
+        ('Genre', 'name', 'name_normalized'),
+    ):
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('id', source))
+        for obj in objects:
+            setattr(obj, target, normalize(getattr(obj, source)))
+        model.objects.bulk_update(objects, [target], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='username_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150, verbose_name='Логин для поиска'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='name_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Название для поиска'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Название для поиска'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+    ]
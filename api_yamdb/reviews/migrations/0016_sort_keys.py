@@ -0,0 +1,75 @@
+# Generated by Django 5.1.1 on 2026-10-17 09:15
+
+from django.db import migrations, models
+
+from reviews.fts import restore_triggers
+from reviews.text import sort_key
+
+
+SORT_KEY_FIELDS = (
+    ('UserProfile', 'username', 'username_sort'),
+    ('Category', 'name', 'name_sort'),
+    ('Genre', 'name', 'name_sort'),
+    ('Title', 'name', 'name_sort'),
+)
+
+
+def fill_sort_keys(apps, schema_editor):
+    for model_name, source, target in SORT_KEY_FIELDS:
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('id', source))
+        for obj in objects:
+            setattr(obj, target, sort_key(getattr(obj, source)))
+        model.objects.bulk_update(objects, [target], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_normalized_names'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='category',
+            options={'ordering': ('name_sort',), 'verbose_name': 'Категория', 'verbose_name_plural': 'Категории'},
+        ),
+        migrations.AlterModelOptions(
+            name='genre',
+            options={'ordering': ('name_sort',), 'verbose_name': 'Жанр', 'verbose_name_plural': 'Жанры'},
+        ),
+        migrations.AlterModelOptions(
+            name='title',
+            options={'ordering': ('name_sort',), 'verbose_name': 'Произведение', 'verbose_name_plural': 'Произведения'},
+        ),
+        migrations.AlterModelOptions(
+            name='userprofile',
+            options={'ordering': ('username_sort',), 'verbose_name': 'Пользователь', 'verbose_name_plural': 'Пользователи'},
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='name_sort',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=770, verbose_name='Ключ сортировки'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_sort',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=770, verbose_name='Ключ сортировки'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='name_sort',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=770, verbose_name='Ключ сортировки'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='username_sort',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=770, verbose_name='Ключ сортировки'),
+            preserve_default=False,
+        ),
+        restore_triggers('reviews_title'),
+        migrations.RunPython(fill_sort_keys, migrations.RunPython.noop),
+    ]
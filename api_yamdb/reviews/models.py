@@ -4,6 +4,7 @@ from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import models
 from django.core.validators import MaxValueValidator, MinValueValidator
 
+from .text import normalize, sort_key
 from .validators import year_validator, forbidden_names_validator
 
 
@@ -13,10 +14,32 @@ CATEGORY_SLUG_MAX_LENGTH = 50
 GENRE_MAX_LENGTH = 256
 GENRE_SLUG_MAX_LENGTH = 50
 TITLE_MAX_LENGTH = 256
+TRIGRAM_LENGTH = 3
 SCORE_MIN_VALUE = 1
 SCORE_MAX_VALUE = 10
+# Байесовский рейтинг: оценки произведения дополняются RATING_PRIOR_WEIGHT
+# условными оценками, равными RATING_PRIOR_MEAN.
+RATING_PRIOR_MEAN = (SCORE_MIN_VALUE + SCORE_MAX_VALUE) / 2
+RATING_PRIOR_WEIGHT = 10
 USERNAME_MAX_LENGTH = 150
 EMAIL_MAX_LENGTH = 254
+# Ключ сортировки состоит из трех вариантов строки и двух разделителей.
+SORT_KEY_MAX_LENGTH = 3 * max(
+    TITLE_MAX_LENGTH, CATEGORY_MAX_LENGTH, GENRE_MAX_LENGTH,
+    USERNAME_MAX_LENGTH,
+) + 2
+
+
+def derived_update_fields(kwargs, source, *derived):
+    """Добавляет в update_fields поля, вычисляемые в save() из source.
+
+    Иначе save(update_fields=[source]), в том числе из update_or_create(),
+    записал бы новое значение без пересчитанных по нему полей.
+    """
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and source in update_fields:
+        kwargs['update_fields'] = {*update_fields, *derived}
+    return kwargs
 
 
 class UserRole(models.TextChoices):
@@ -37,6 +60,18 @@ class UserProfile(AbstractUser):
         unique=True,
         validators=[UnicodeUsernameValidator(), forbidden_names_validator],
     )
+    username_normalized = models.CharField(
+        'Логин для поиска',
+        max_length=USERNAME_MAX_LENGTH,
+        db_index=True,
+        editable=False,
+    )
+    username_sort = models.CharField(
+        'Ключ сортировки',
+        max_length=SORT_KEY_MAX_LENGTH,
+        db_index=True,
+        editable=False,
+    )
     bio = models.TextField('Биография', blank=True)
     role = models.CharField(
         'Роль',
@@ -48,11 +83,18 @@ class UserProfile(AbstractUser):
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
-        ordering = ('username',)
+        ordering = ('username_sort',)
 
     def __str__(self):
         return f'Пользователь: {self.username}'
 
+    def save(self, *args, **kwargs):
+        self.username_normalized = normalize(self.username)
+        self.username_sort = sort_key(self.username)
+        super().save(*args, **derived_update_fields(
+            kwargs, 'username', 'username_normalized', 'username_sort'
+        ))
+
     @property
     def is_moderator(self):
         return self.role == UserRole.MODERATOR
@@ -66,6 +108,18 @@ class Category(models.Model):
     """Класс для описания категорий произведений."""
 
     name = models.CharField('Категория', max_length=CATEGORY_MAX_LENGTH)
+    name_normalized = models.CharField(
+        'Название для поиска',
+        max_length=CATEGORY_MAX_LENGTH,
+        db_index=True,
+        editable=False,
+    )
+    name_sort = models.CharField(
+        'Ключ сортировки',
+        max_length=SORT_KEY_MAX_LENGTH,
+        db_index=True,
+        editable=False,
+    )
     slug = models.SlugField(
         'Слаг категории', max_length=CATEGORY_SLUG_MAX_LENGTH, unique=True
     )
@@ -73,16 +127,35 @@ class Category(models.Model):
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
-        ordering = ('name',)
+        ordering = ('name_sort',)
 
     def __str__(self):
         return f'Категория произведения: {self.name}'
 
+    def save(self, *args, **kwargs):
+        self.name_normalized = normalize(self.name)
+        self.name_sort = sort_key(self.name)
+        super().save(*args, **derived_update_fields(
+            kwargs, 'name', 'name_normalized', 'name_sort'
+        ))
+
 
 class Genre(models.Model):
     """Класс для описания жанров произведений."""
 
     name = models.CharField('Жанр', max_length=GENRE_MAX_LENGTH)
+    name_normalized = models.CharField(
+        'Название для поиска',
+        max_length=GENRE_MAX_LENGTH,
+        db_index=True,
+        editable=False,
+    )
+    name_sort = models.CharField(
+        'Ключ сортировки',
+        max_length=SORT_KEY_MAX_LENGTH,
+        db_index=True,
+        editable=False,
+    )
     slug = models.SlugField(
         'Слаг жанра', max_length=GENRE_SLUG_MAX_LENGTH, unique=True
     )
@@ -90,31 +163,145 @@ class Genre(models.Model):
     class Meta:
         verbose_name = 'Жанр'
         verbose_name_plural = 'Жанры'
-        ordering = ('name',)
+        ordering = ('name_sort',)
 
     def __str__(self):
         return f'Жанр произведения: {self.name}'
 
+    def save(self, *args, **kwargs):
+        self.name_normalized = normalize(self.name)
+        self.name_sort = sort_key(self.name)
+        super().save(*args, **derived_update_fields(
+            kwargs, 'name', 'name_normalized', 'name_sort'
+        ))
+
 
 class Title(models.Model):
     """Класс для описания произведения."""
 
     name = models.CharField('Название', max_length=TITLE_MAX_LENGTH)
+    name_sort = models.CharField(
+        'Ключ сортировки',
+        max_length=SORT_KEY_MAX_LENGTH,
+        db_index=True,
+        editable=False,
+    )
     year = models.SmallIntegerField('Год выпуска', validators=[year_validator])
     description = models.TextField('Описание', blank=True, default='')
     genre = models.ManyToManyField('Genre', related_name='titles')
     category = models.ForeignKey(
         'Category', related_name='titles', on_delete=models.SET_NULL, null=True
     )
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0)
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок', default=0
+    )
+    rating = models.FloatField('Рейтинг', null=True, blank=True)
+    weighted_rating = models.FloatField(
+        'Взвешенный рейтинг', default=RATING_PRIOR_MEAN
+    )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
-        ordering = ('name',)
+        ordering = ('name_sort',)
+        indexes = [
+            models.Index(fields=('year', 'id'), name='title_year_idx'),
+            models.Index(fields=('rating', 'id'), name='title_rating_idx'),
+            models.Index(
+                fields=('name_sort', 'id'), name='title_name_sort_idx'
+            ),
+            models.Index(
+                fields=('rating_count', 'id'), name='title_rating_count_idx'
+            ),
+            models.Index(
+                fields=('category', 'rating', 'id'),
+                name='title_cat_rating_idx',
+            ),
+            models.Index(
+                fields=('weighted_rating', 'id'),
+                name='title_weighted_rating_idx',
+            ),
+            models.Index(
+                fields=('category', 'weighted_rating', 'id'),
+                name='title_cat_weighted_rating_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'Произведение: {self.name}'
 
+    def save(self, *args, **kwargs):
+        self.name_sort = sort_key(self.name)
+        super().save(
+            *args, **derived_update_fields(kwargs, 'name', 'name_sort')
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Название на момент загрузки нужно, чтобы перестраивать
+        # триграммы только при переименовании.
+        instance._loaded_name = instance.__dict__.get('name')
+        return instance
+
+
+class TitleTrigram(models.Model):
+    """Класс триграмм названия произведения для нечеткого поиска."""
+
+    title = models.ForeignKey(
+        'Title', related_name='trigrams', on_delete=models.CASCADE
+    )
+    trigram = models.CharField('Триграмма', max_length=TRIGRAM_LENGTH)
+
+    class Meta:
+        verbose_name = 'Триграмма названия'
+        verbose_name_plural = 'Триграммы названий'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('trigram', 'title'), name='unique_title_trigram'
+            )
+        ]
+
+
+class TitleScoreHistogram(models.Model):
+    """Класс счетчиков оценок произведения по значениям от 1 до 10."""
+
+    title = models.OneToOneField(
+        'Title',
+        primary_key=True,
+        related_name='score_histogram',
+        on_delete=models.CASCADE,
+    )
+    score_1 = models.PositiveIntegerField('Оценок 1', default=0)
+    score_2 = models.PositiveIntegerField('Оценок 2', default=0)
+    score_3 = models.PositiveIntegerField('Оценок 3', default=0)
+    score_4 = models.PositiveIntegerField('Оценок 4', default=0)
+    score_5 = models.PositiveIntegerField('Оценок 5', default=0)
+    score_6 = models.PositiveIntegerField('Оценок 6', default=0)
+    score_7 = models.PositiveIntegerField('Оценок 7', default=0)
+    score_8 = models.PositiveIntegerField('Оценок 8', default=0)
+    score_9 = models.PositiveIntegerField('Оценок 9', default=0)
+    score_10 = models.PositiveIntegerField('Оценок 10', default=0)
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return f'Распределение оценок: {self.title_id}'
+
+    @staticmethod
+    def bucket_field(score):
+        return f'score_{score}'
+
+    @property
+    def buckets(self):
+        return [
+            getattr(self, self.bucket_field(score))
+            for score in range(SCORE_MIN_VALUE, SCORE_MAX_VALUE + 1)
+        ]
+
 
 class Review(models.Model):
     """Класс для отзывов на произведения."""
@@ -136,6 +323,9 @@ class Review(models.Model):
     )
     pub_date = models.DateTimeField('Дата публикации', auto_now_add=True)
     text = models.TextField('Текст')
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
@@ -145,11 +335,22 @@ class Review(models.Model):
                 fields=['author', 'title'], name='unique_review_author_title'
             )
         ]
+        indexes = [
+            models.Index(fields=('title', 'id'), name='review_title_id_idx'),
+        ]
         ordering = ('pub_date',)
 
     def __str__(self):
         return f'Отзыв на произведение: {self.name}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Оценка на момент загрузки нужна, чтобы при изменении отзыва
+        # сдвинуть рейтинг произведения на разницу, а не пересчитывать его.
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(models.Model):
     """Класс комментариев к отзывам."""
@@ -168,6 +369,11 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'id'), name='comment_review_id_idx'
+            ),
+        ]
         ordering = ('pub_date',)
 
     def __str__(self):
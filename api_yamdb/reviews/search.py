@@ -0,0 +1,133 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import connections
+from django.db.models import CharField, Count, F, Q, Value
+from django.db.models.functions import Cast
+from django.db.models.expressions import RawSQL
+
+from .models import Title, TitleTrigram, Review
+from .text import fold, trigrams
+
+
+SEARCH_FIELDS = {
+    Title: ('name', 'description'),
+    Review: ('text',),
+}
+WORD_RE = re.compile(r'\w+')
+FUZZY_MIN_SIMILARITY = 0.3
+# Кандидатов по числу общих триграмм берется с запасом: точная похожесть
+# учитывает и длину названия, поэтому порядок может измениться.
+FUZZY_CANDIDATES_FACTOR = 5
+TITLE_FACETS = ('genre', 'category', 'year')
+DECADE = 10
+
+
+def fts_query(text):
+    """Запрос FTS5: все слова обязательны и ищутся как префиксы.
+
+    Префиксный поиск частично заменяет стемминг: «фильм» найдет и
+    «фильмы», и «фильмов». Регистр сворачивает токенизатор индекса.
+    """
+    words = WORD_RE.findall(fold(text))
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def full_text_search(queryset, text):
+    """Фильтрует выборку по тексту и сортирует по релевантности."""
+    fields = SEARCH_FIELDS[queryset.model]
+    if connections[queryset.db].vendor != 'sqlite':
+        return queryset.filter(reduce(or_, (
+            Q(**{f'{field}__icontains': text}) for field in fields
+        )))
+    query = fts_query(text)
+    if query is None:
+        return queryset.none()
+    table = queryset.model._meta.db_table
+    fts = f'{table}_fts'
+    return (
+        queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [query]
+        ))
+        .annotate(search_rank=RawSQL(
+            f'SELECT rank FROM {fts} '
+            f'WHERE {fts} MATCH %s AND rowid = "{table}"."id"',
+            [query],
+        ))
+        .order_by('search_rank', 'id')
+    )
+
+
+def index_title_trigrams(title):
+    """Перестраивает триграммы названия произведения."""
+    TitleTrigram.objects.filter(title=title).delete()
+    TitleTrigram.objects.bulk_create(
+        TitleTrigram(title=title, trigram=trigram)
+        for trigram in trigrams(title.name)
+    )
+
+
+def fuzzy_title_search(text, limit, min_similarity=FUZZY_MIN_SIMILARITY):
+    """Произведения с похожими названиями, от наиболее похожих.
+
+    Кандидаты выбираются по индексу триграмм: просматриваются только
+    произведения, у которых есть хотя бы одна общая с запросом триграмма.
+    Похожесть считается как в pg_trgm: доля общих триграмм в объединении.
+    """
+    query_trigrams = trigrams(text)
+    if not query_trigrams:
+        return []
+    shared = dict(
+        TitleTrigram.objects.filter(trigram__in=query_trigrams)
+        .values('title_id')
+        .annotate(shared=Count('id'))
+        .order_by('-shared', 'title_id')
+        .values_list('title_id', 'shared')[:limit * FUZZY_CANDIDATES_FACTOR]
+    )
+    titles = (
+        Title.objects.filter(id__in=shared)
+        .select_related('category')
+        .prefetch_related('genre')
+    )
+    ranked = []
+    for title in titles:
+        similarity = shared[title.id] / len(
+            query_trigrams | trigrams(title.name)
+        )
+        if similarity >= min_similarity:
+            title.similarity = similarity
+            ranked.append(title)
+    ranked.sort(key=lambda title: (-title.similarity, title.id))
+    return ranked[:limit]
+
+
+def title_facets(queryset, names):
+    """Количество произведений выборки по жанрам, категориям и десятилетиям.
+
+    Все срезы считаются одним SQL-запросом: группировки по каждому срезу
+    объединяются через UNION ALL.
+    """
+    titles = queryset.order_by()
+    facets = {
+        'genre': Title.genre.through.objects.filter(
+            title_id__in=titles.values('id')
+        ).values(key=F('genre__slug')),
+        'category': titles.values(key=F('category__slug')),
+        'year': titles.values(key=Cast(
+            F('year') / DECADE * DECADE, CharField()
+        )),
+    }
+    parts = [
+        facets[name]
+        .annotate(facet=Value(name), count=Count('id', distinct=True))
+        .values('facet', 'key', 'count')
+        .order_by()
+        for name in names
+    ]
+    result = {name: {} for name in names}
+    for row in parts[0].union(*parts[1:], all=True):
+        result[row['facet']][row['key']] = row['count']
+    return result
@@ -0,0 +1,75 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .aggregates import (
+    apply_review_change,
+    rebuild_title_scores,
+    shift_comment_count,
+)
+from .models import Title, TitleScoreHistogram, Review, Comment
+from .search import index_title_trigrams
+
+
+# bulk_create и bulk_update не отправляют post_save: после пакетной записи
+# произведений отправляется этот сигнал с id созданных и обновленных.
+titles_bulk_saved = Signal()
+# Пакетное удаление обходит post_delete: сигнал отправляется от имени
+# модели, записи которой удалены, после каждой порции.
+bulk_deleted = Signal()
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, raw, update_fields, **kwargs):
+    if created and not raw:
+        TitleScoreHistogram.objects.get_or_create(title=instance)
+    renamed = instance.name != getattr(instance, '_loaded_name', None)
+    if created or (
+        renamed and (update_fields is None or 'name' in update_fields)
+    ):
+        index_title_trigrams(instance)
+    instance._loaded_name = instance.name
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw, update_fields, **kwargs):
+    if raw:
+        # loaddata загружает и отзывы, и уже посчитанный по ним рейтинг.
+        return
+    if created:
+        apply_review_change(instance.title_id, new_score=instance.score)
+    elif update_fields is not None and 'score' not in update_fields:
+        return
+    elif getattr(instance, '_loaded_score', None) is None:
+        rebuild_title_scores(instance.title_id)
+    elif instance.score != instance._loaded_score:
+        apply_review_change(
+            instance.title_id, instance._loaded_score, instance.score
+        )
+    instance._loaded_score = instance.score
+
+
+def deleted_with(origin, *models):
+    """Удаление каскадом от объекта, чьи счетчики удаляются вместе с ним."""
+    if isinstance(origin, QuerySet):
+        return issubclass(origin.model, models)
+    return isinstance(origin, models)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, origin, **kwargs):
+    if deleted_with(origin, Title):
+        return
+    apply_review_change(instance.title_id, old_score=instance.score)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        shift_comment_count(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin, **kwargs):
+    if not deleted_with(origin, Title, Review):
+        shift_comment_count(instance.review_id, -1)
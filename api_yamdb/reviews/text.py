@@ -0,0 +1,59 @@
+import re
+
+
+TRANSLITERATION = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ж': 'zh',
+    'з': 'z', 'и': 'i', 'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
+    'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f',
+    'х': 'h', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sch', 'ъ': '',
+    'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+})
+WORD_RE = re.compile(r'[^\W_]+')
+# Разделитель уровней ключа сортировки меньше любого печатного символа.
+# Нулевой символ не подходит: PostgreSQL не хранит его в строках.
+SORT_KEY_SEPARATOR = '\x01'
+
+
+def fold(text):
+    """Заменяет ё на е с сохранением регистра."""
+    return text.replace('ё', 'е').replace('Ё', 'Е')
+
+
+def normalize(text):
+    """Нижний регистр, ё как е, пробелы схлопнуты: ключ поиска и сравнения."""
+    return ' '.join(fold(text.lower()).split())
+
+
+def sort_key(text):
+    """Ключ сортировки строк по правилам русского алфавита.
+
+    Ключи сравниваются двоично: сначала строки сравниваются без учета
+    регистра и различия «е» и «ё», при равенстве «ё» идет после «е»,
+    затем строчные буквы раньше прописных. Это не ICU-сопоставление:
+    символы разных групп упорядочены по кодам Unicode, поэтому цифры и
+    латиница идут раньше кириллицы, а кавычки «» — между ними.
+    """
+    words = ' '.join(text.split())
+    return SORT_KEY_SEPARATOR.join(
+        (normalize(words), words.lower(), words.swapcase())
+    )
+
+
+def transliterate(text):
+    """Латинская запись текста для сравнения с транслитерацией."""
+    return normalize(text).translate(TRANSLITERATION)
+
+
+def trigrams(text):
+    """Множество триграмм слов текста, как в pg_trgm.
+
+    Перед сравнением текст переводится в латиницу, поэтому «Терминатор»
+    и «terminator» дают одинаковые триграммы.
+    """
+    result = set()
+    for word in WORD_RE.findall(transliterate(text)):
+        padded = f'  {word} '
+        result.update(
+            padded[start:start + 3] for start in range(len(padded) - 2)
+        )
+    return result
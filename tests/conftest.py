@@ -1,6 +1,9 @@
 import os
 import sys
 
+import pytest
+from django.core.cache import cache
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
 
@@ -29,3 +32,14 @@ if FILENAME not in project_dir_content:
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from api.v1.autocomplete import AUTOCOMPLETE_INDEXES
+    from api.v1.title_index import title_bitmap_index
+
+    cache.clear()
+    title_bitmap_index.invalidate()
+    for index in AUTOCOMPLETE_INDEXES.values():
+        index.invalidate()
@@ -0,0 +1,276 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from api.v1.views import ReviewViewSet
+from reviews.aggregates import actual_title_scores, apply_review_change
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_review_writes(self, admin_client, user_client,
+                                             moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_title(admin_client, title_id)['rating'] is None, (
+            'Проверьте, что у произведения без отзывов поле `rating` '
+            'равно `None`.'
+        )
+
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        review = create_single_review(
+            user_client, title_id, 'Так себе', 3
+        ).json()
+        assert self.get_title(admin_client, title_id)['rating'] == 6, (
+            'Проверьте, что после создания отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(admin_client, title_id)['rating'] == 9, (
+            'Проверьте, что после изменения оценки отзыва рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        response = moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(admin_client, title_id)['rating'] == 10, (
+            'Проверьте, что после удаления отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+    def test_02_rating_after_author_deleted(self, admin_client, user,
+                                            user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Так себе', 3)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(admin_client, title_id)['rating'] is None, (
+            'Проверьте, что при удалении автора вместе с его отзывами '
+            'рейтинг произведения пересчитывается.'
+        )
+
+    def test_03_recompute_ratings_command(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Так себе', 3)
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=0, rating_count=0, rating=None
+        )
+
+        with pytest.raises(CommandError):
+            call_command('recompute_ratings', '--verify', stdout=StringIO())
+        assert self.get_title(admin_client, title_id)['rating'] is None, (
+            'Проверьте, что режим `--verify` команды `recompute_ratings` '
+            'не изменяет данные.'
+        )
+
+        call_command('recompute_ratings', '--chunk-size=1', stdout=StringIO())
+        assert self.get_title(admin_client, title_id)['rating'] == 3, (
+            'Проверьте, что команда `recompute_ratings` восстанавливает '
+            'рейтинг произведения по его отзывам.'
+        )
+        call_command('recompute_ratings', '--verify', stdout=StringIO())
+
+        Title.objects.filter(pk=title_id).update(rating=9.9)
+        with pytest.raises(CommandError):
+            call_command('recompute_ratings', '--verify', stdout=StringIO())
+        call_command('recompute_ratings', stdout=StringIO())
+        assert self.get_title(admin_client, title_id)['rating'] == 3, (
+            'Проверьте, что команда `recompute_ratings` сверяет и '
+            'восстанавливает поле `rating`.'
+        )
+
+    def test_04_title_stats(self, client, admin_client, user_client,
+                            moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/stats/'
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        assert response.json()['count'] == 0
+
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        create_single_review(user_client, title_id, 'Так себе', 4)
+        review = create_single_review(
+            moderator_client, title_id, 'Неплохо', 6
+        ).json()
+        moderator_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            ),
+            data={'score': 7}
+        )
+
+        data = client.get(url).json()
+        assert data['count'] == 3
+        assert data['mean'] == 7
+        assert data['median'] == 7
+        assert data['std_dev'] == pytest.approx(2.4494897)
+        assert data['histogram'] == {
+            str(score): int(score in (4, 7, 10)) for score in range(1, 11)
+        }, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'распределение оценок с учетом изменения отзыва.'
+        )
+
+        for missing_id in ('0', 'abc'):
+            response = client.get(f'/api/v1/titles/{missing_id}/stats/')
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `/api/v1/titles/{missing_id}'
+                '/stats/` возвращает ответ со статусом 404.'
+            )
+            assert 'TitleScoreHistogram' not in response.json()['detail']
+
+        response = admin_client.delete(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что произведение с отзывами удаляется вместе с '
+            'распределением оценок.'
+        )
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_top_titles(self, client, admin_client, user_client,
+                           moderator_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = '/api/v1/titles/top/'
+        create_single_review(admin_client, titles[0]['id'], 'Шедевр', 10)
+        for author_client in (admin_client, user_client, moderator_client):
+            create_single_review(
+                author_client, titles[1]['id'], 'Хорошо', 9
+            )
+
+        low = admin_client.post('/api/v1/titles/', data={
+            'name': 'Провал',
+            'year': 2000,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }).json()
+        create_single_review(user_client, low['id'], 'Плохо', 2)
+        unrated = admin_client.post('/api/v1/titles/', data={
+            'name': 'Без отзывов',
+            'year': 2001,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }).json()
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        assert unrated['id'] not in [title['id'] for title in data], (
+            'Проверьте, что в рейтинг не попадают произведения без отзывов.'
+        )
+        assert [title['id'] for title in data] == [
+            titles[1]['id'], titles[0]['id'], low['id']
+        ], (
+            'Проверьте, что единственная высокая оценка не поднимает '
+            'произведение выше произведений с большим числом оценок.'
+        )
+        assert data[0]['weighted_rating'] > data[1]['weighted_rating']
+
+        response = client.get(
+            f'{url}?category={categories[0]["slug"]}&limit=1'
+        )
+        assert [title['id'] for title in response.json()] == [
+            titles[0]['id']
+        ]
+        response = client.get(f'{url}?genre={genres[2]["slug"]}')
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id']
+        ]
+        response = client.get(f'{url}?limit=0')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_06_concurrent_review_update(self, admin_client, user_client,
+                                         monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        review = create_single_review(
+            user_client, title_id, 'Так себе', 3
+        ).json()
+        get_object = ReviewViewSet.get_object
+
+        def get_object_then_concurrent_update(view):
+            instance = get_object(view)
+            # Параллельный запрос меняет оценку после загрузки отзыва.
+            Review.objects.filter(pk=instance.pk).update(score=7)
+            apply_review_change(title_id, instance.score, 7)
+            return instance
+
+        monkeypatch.setattr(
+            ReviewViewSet, 'get_object', get_object_then_concurrent_update
+        )
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            ),
+            data={'score': 5},
+        )
+        assert response.status_code == HTTPStatus.OK
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (15, 2), (
+            'Проверьте, что рейтинг сдвигается от оценки, прочитанной в '
+            'транзакции изменения отзыва.'
+        )
+        assert title.score_histogram.buckets == actual_title_scores(
+            [title_id]
+        )[title_id]
+
+    def test_07_raw_review_load(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(
+            user_client, title_id, 'Так себе', 3
+        ).json()
+        dump = serializers.serialize(
+            'json', Review.objects.filter(pk=review['id'])
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM reviews_review WHERE id = %s', [review['id']]
+            )
+        for loaded in serializers.deserialize('json', dump):
+            loaded.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (3, 1), (
+            'Проверьте, что загрузка фикстур не учитывает отзывы повторно.'
+        )
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Counters:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/'
+    )
+
+    def test_01_review_and_comment_counts(self, admin_client, admin, user,
+                                          user_client, moderator,
+                                          moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        assert admin_client.get(title_url).json()['review_count'] == 3, (
+            f'Проверьте, что ответ на GET-запрос к `{title_url}` содержит '
+            'поле `review_count` с количеством отзывов.'
+        )
+        assert admin_client.get(review_url).json()['comment_count'] == 3, (
+            f'Проверьте, что ответ на GET-запрос к `{review_url}` содержит '
+            'поле `comment_count` с количеством комментариев.'
+        )
+
+        response = admin_client.delete(
+            self.COMMENT_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'],
+                review_id=reviews[0]['id'],
+                comment_id=comments[0]['id'],
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert admin_client.get(review_url).json()['comment_count'] == 2
+
+        response = admin_client.patch(review_url, data={'comment_count': 50})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['comment_count'] == 2, (
+            'Проверьте, что поле `comment_count` доступно только для чтения.'
+        )
+
+    def test_02_counts_after_cascade(self, admin_client, admin, user,
+                                     user_client, moderator,
+                                     moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        _, reviews, titles = create_comments(admin_client, author_map)
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[1]['id'], 'Согласен'
+        )
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert admin_client.get(title_url).json()['review_count'] == 2, (
+            'Проверьте, что при удалении автора вместе с его отзывами '
+            'счетчик отзывов произведения уменьшается.'
+        )
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        assert admin_client.get(review_url).json()['comment_count'] == 2, (
+            'Проверьте, что при удалении автора вместе с его комментариями '
+            'счетчик комментариев отзыва уменьшается.'
+        )
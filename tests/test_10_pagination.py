@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    def collect_pages(self, client, url):
+        ids, pages = [], 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не считает общее '
+                'количество объектов.'
+            )
+            ids.extend(item.get('id', item.get('username'))
+                       for item in data['results'])
+            url = data['next']
+            pages += 1
+        return ids, pages
+
+    def test_01_titles_cursor(self, client):
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(25)
+        ]
+
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 25, (
+            'Проверьте, что без параметра `cursor` используется '
+            'постраничная пагинация.'
+        )
+
+        ids, pages = self.collect_pages(client, f'{self.TITLES_URL}?cursor=')
+        assert ids == [title.id for title in titles], (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения по порядку.'
+        )
+        assert pages == 2
+
+    def test_02_users_cursor(self, admin_client, admin, django_user_model):
+        for idx in range(21):
+            django_user_model.objects.create_user(
+                username=f'user{idx:02}', email=f'user{idx}@yamdb.fake'
+            )
+
+        usernames, pages = self.collect_pages(
+            admin_client, f'{self.USERS_URL}?cursor='
+        )
+        assert usernames == sorted(
+            django_user_model.objects.values_list('username', flat=True)
+        ), (
+            f'Проверьте, что курсорная пагинация `{self.USERS_URL}` '
+            'возвращает пользователей по порядку логинов.'
+        )
+        assert pages == 2
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CachedCount:
+
+    CATEGORY_URL = '/api/v1/categories/'
+
+    def test_01_count_is_cached_until_write(self, client, admin_client,
+                                            django_assert_num_queries):
+        admin_client.post(
+            self.CATEGORY_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert client.get(self.CATEGORY_URL).json()['count'] == 1
+
+        with django_assert_num_queries(1):
+            response = client.get(self.CATEGORY_URL)
+        assert response.json()['count'] == 1, (
+            'Проверьте, что повторный запрос списка берет количество '
+            'объектов из кеша.'
+        )
+
+        admin_client.post(
+            self.CATEGORY_URL, data={'name': 'Книги', 'slug': 'books'}
+        )
+        assert client.get(self.CATEGORY_URL).json()['count'] == 2, (
+            'Проверьте, что запись в модель сбрасывает закешированное '
+            'количество объектов.'
+        )
+        response = client.get(f'{self.CATEGORY_URL}?search=Книги')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что количество кешируется отдельно для каждого '
+            'набора фильтров.'
+        )
+        assert 'approximate' not in response.json()
+
+    def test_02_empty_where(self, client):
+        for query in ('q=!', 'q=***&layout=columnar', 'ids=,'):
+            response = client.get(f'/api/v1/titles/?{query}')
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `/api/v1/titles/?{query}` возвращает ответ '
+                'со статусом 200.'
+            )
+            assert response.json()['count'] == 0
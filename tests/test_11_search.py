@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11FullTextSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEW_SEARCH_URL = '/api/v1/reviews/search/'
+
+    def test_01_title_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'description': 'Ёлка, небоскрёб и терминатор'}
+        )
+
+        response = client.get(f'{self.TITLES_URL}?q=ТЕРМИНАТОР')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [
+            titles[0]['id'], titles[1]['id']
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}?q=` ищет по названию и '
+            'описанию без учета регистра, а совпадение в названии '
+            'ранжируется выше.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?q=небоскреб ел')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id']
+        ], (
+            'Проверьте, что поиск не различает `е` и `ё` и находит слова '
+            'по началу.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?q=орешек чужой')
+        assert response.json()['count'] == 0
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        response = client.get(f'{self.TITLES_URL}?q=чужой')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+
+        for query in ('!', '-', '***'):
+            response = client.get(f'{self.TITLES_URL}?q={query}')
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что запрос `{self.TITLES_URL}?q={query}` без '
+                'слов возвращает ответ со статусом 200.'
+            )
+            assert response.json()['count'] == 0
+
+    def test_02_review_search(self, admin_client, admin, user, user_client,
+                              moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, _ = create_reviews(admin_client, author_map)
+
+        response = user_client.get(f'{self.REVIEW_SEARCH_URL}?q=review')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.REVIEW_SEARCH_URL}` доступен только '
+            'администратору.'
+        )
+
+        response = admin_client.get(f'{self.REVIEW_SEARCH_URL}?q=number 2')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [review['id'] for review in data['results']] == [
+            reviews[1]['id']
+        ], (
+            f'Проверьте, что `{self.REVIEW_SEARCH_URL}?q=` ищет по тексту '
+            'отзывов.'
+        )
+        response = admin_client.get(f'{self.REVIEW_SEARCH_URL}?q=!')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11FuzzySearch:
+
+    FUZZY_URL = '/api/v1/titles/fuzzy/'
+
+    def test_01_fuzzy_title_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+
+        response = client.get(f'{self.FUZZY_URL}?q=terminatr')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.FUZZY_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == [titles[0]['id']], (
+            f'Проверьте, что `{self.FUZZY_URL}` находит произведение по '
+            'транслитерации названия с опечаткой.'
+        )
+        assert 0 < data[0]['similarity'] < 1
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Чужие'}
+        )
+        response = client.get(f'{self.FUZZY_URL}?q=Чюжие')
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id']
+        ], (
+            'Проверьте, что индекс триграмм обновляется при переименовании '
+            'произведения.'
+        )
+        assert client.get(f'{self.FUZZY_URL}?q=орешек').json() == []
+        assert client.get(self.FUZZY_URL).status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
@@ -0,0 +1,194 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_facets(self, client, admin_client,
+                       django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+
+        response = client.get(
+            f'{self.TITLES_URL}?facets=genre,category,year'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['facets'] == {
+            'genre': {'horror': 2, 'comedy': 1, 'drama': 1},
+            'category': {'films': 2, 'books': 1},
+            'year': {'1970': 1, '1980': 2},
+        }, (
+            f'Проверьте, что `{self.TITLES_URL}?facets=` возвращает '
+            'количество произведений по жанрам, категориям и десятилетиям.'
+        )
+
+        response = client.get(
+            f'{self.TITLES_URL}?genre=horror&facets=genre,year'
+        )
+        data = response.json()
+        assert data['count'] == 2
+        assert data['facets'] == {
+            'genre': {'horror': 2, 'comedy': 1},
+            'year': {'1970': 1, '1980': 1},
+        }, (
+            'Проверьте, что срезы считаются по отфильтрованной выборке.'
+        )
+
+        with django_assert_max_num_queries(3):
+            client.get(f'{self.TITLES_URL}?facets=genre,category,year')
+
+        response = client.get(f'{self.TITLES_URL}?facets=author')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_extended_filters(self, client, admin_client, user_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[1]['slug'],
+        })
+        alien_id = response.json()['id']
+        create_single_review(user_client, titles[1]['id'], 'Отлично', 9)
+        create_single_review(user_client, alien_id, 'Так себе', 5)
+
+        cases = (
+            ('year_min=1980', {titles[0]['id'], titles[1]['id']}),
+            ('year_min=1980&year_max=1985', {titles[0]['id']}),
+            ('genre=horror,drama', {titles[0]['id'], titles[1]['id'],
+                                    alien_id}),
+            ('genre=horror,drama&genre_mode=all', {alien_id}),
+            ('genre=horror,comedy&genre_mode=all', {titles[0]['id']}),
+            ('category=films,books&year_max=1985', {titles[0]['id'],
+                                                    alien_id}),
+            ('rating_min=6', {titles[1]['id']}),
+            ('rating_min=4&rating_max=6', {alien_id}),
+        )
+        for query, expected in cases:
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            found = [title['id'] for title in data['results']]
+            assert len(found) == data['count'] == len(expected), (
+                f'Проверьте, что фильтр `{self.TITLES_URL}?{query}` не '
+                'дублирует произведения.'
+            )
+            assert set(found) == expected, (
+                f'Проверьте, что фильтр `{self.TITLES_URL}?{query}` '
+                'возвращает подходящие произведения.'
+            )
+
+        response = client.get(f'{self.TITLES_URL}?genre_mode=some')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_ordering(self, client, admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': 'films',
+        })
+        alien = response.json()
+        create_single_review(admin_client, titles[0]['id'], 'Хорошо', 8)
+        create_single_review(user_client, titles[0]['id'], 'Так себе', 4)
+        create_single_review(admin_client, alien['id'], 'Отлично', 9)
+
+        for query, expected in (
+            ('ordering=year', [alien, titles[0], titles[1]]),
+            ('ordering=-year', [titles[1], titles[0], alien]),
+            ('ordering=name', [titles[1], titles[0], alien]),
+            ('ordering=-review_count,name', [titles[0], alien, titles[1]]),
+            ('genre=horror&ordering=-rating', [alien, titles[0]]),
+        ):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.OK
+            assert [
+                title['id'] for title in response.json()['results']
+            ] == [title['id'] for title in expected], (
+                f'Проверьте, что `{self.TITLES_URL}?{query}` сортирует '
+                'произведения.'
+            )
+
+        for query in ('ordering=description', 'ordering=year&cursor='):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.TITLES_URL}?{query}` возвращает '
+                'ответ со статусом 400.'
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleBitmapIndex:
+
+    TITLES_URL = '/api/v1/titles/'
+    QUERIES = (
+        '',
+        'genre=horror',
+        'genre=horror,drama',
+        'genre=horror,comedy&genre_mode=all',
+        'category=books',
+        'category=films,books&year_max=1985',
+        'year=1988',
+        'year_min=1980&genre=drama',
+        'category=unknown',
+        'genre=horror&page=1',
+        'genre=horror&ordering=-year',
+    )
+
+    def collect(self, client, settings, enabled):
+        settings.TITLE_BITMAP_INDEX_ENABLED = enabled
+        results = {}
+        for query in self.QUERIES:
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.OK
+            results[query] = response.json()
+        return results
+
+    def test_01_index_matches_database(self, client, admin_client, settings,
+                                       django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug'], genres[2]['slug']],
+            'category': categories[1]['slug'],
+        })
+        alien_id = response.json()['id']
+        assert self.collect(client, settings, True) == self.collect(
+            client, settings, False
+        ), (
+            'Проверьте, что индекс произведений в памяти возвращает те же '
+            'результаты, что и запрос к базе.'
+        )
+
+        admin_client.patch(f'{self.TITLES_URL}{alien_id}/', data={
+            'year': 1986,
+            'genre': [genres[1]['slug']],
+            'category': categories[0]['slug'],
+        })
+        admin_client.delete(f'{self.TITLES_URL}{titles[1]["id"]}/')
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Фантастика', 'slug': 'sci-fi'
+        })
+        assert self.collect(client, settings, True) == self.collect(
+            client, settings, False
+        ), (
+            'Проверьте, что индекс произведений в памяти обновляется при '
+            'изменении и удалении произведений.'
+        )
+
+        settings.TITLE_BITMAP_INDEX_ENABLED = True
+        with django_assert_max_num_queries(2):
+            client.get(f'{self.TITLES_URL}?genre=comedy&year_min=1980')
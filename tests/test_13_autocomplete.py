@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Autocomplete:
+
+    AUTOCOMPLETE_URL = '/api/v1/autocomplete/'
+
+    def test_01_autocomplete(self, client, admin_client, user_client, admin):
+        titles, _, _ = create_titles(admin_client)
+
+        response = client.get(f'{self.AUTOCOMPLETE_URL}?q=КРЕП&kind=title')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.AUTOCOMPLETE_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        assert response.json() == [
+            {'id': titles[1]['id'], 'name': 'Крепкий орешек'}
+        ], (
+            'Проверьте, что автодополнение ищет по началу названия без '
+            'учета регистра.'
+        )
+        response = client.get(f'{self.AUTOCOMPLETE_URL}?q=ореш&kind=title')
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id']
+        ], 'Проверьте, что автодополнение ищет по началу любого слова.'
+
+        admin_client.post('/api/v1/genres/', data={
+            'name': 'Фэнтези', 'slug': 'fantasy'
+        })
+        response = client.get(f'{self.AUTOCOMPLETE_URL}?q=ф&kind=genre')
+        assert response.json() == [{'name': 'Фэнтези', 'slug': 'fantasy'}], (
+            'Проверьте, что индекс автодополнения обновляется после записи.'
+        )
+        response = client.get(f'{self.AUTOCOMPLETE_URL}?q=ф&kind=category')
+        assert response.json() == [{'name': 'Фильм', 'slug': 'films'}]
+
+        url = f'{self.AUTOCOMPLETE_URL}?q=testa&kind=user'
+        assert client.get(url).status_code == HTTPStatus.FORBIDDEN
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что поиск пользователей доступен только '
+            'администратору.'
+        )
+        assert admin_client.get(url).json() == [
+            {'username': admin.username}
+        ]
+
+        response = client.get(f'{self.AUTOCOMPLETE_URL}?q=а&kind=review')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14NormalizedSearch:
+
+    CATEGORY_URL = '/api/v1/categories/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_category_search(self, client, admin_client):
+        for name, slug in (
+            ('Ёлочные игрушки', 'toys'),
+            ('Елки  и палки', 'trees'),
+            ('Книги', 'books'),
+        ):
+            response = admin_client.post(
+                self.CATEGORY_URL, data={'name': name, 'slug': slug}
+            )
+            assert response.status_code == HTTPStatus.CREATED
+
+        response = client.get(f'{self.CATEGORY_URL}?search=ЕЛ')
+        assert response.status_code == HTTPStatus.OK
+        assert {
+            category['slug'] for category in response.json()['results']
+        } == {'toys', 'trees'}, (
+            'Проверьте, что поиск категорий не учитывает регистр и не '
+            'различает буквы «е» и «ё».'
+        )
+        response = client.get(f'{self.CATEGORY_URL}?search=елки и')
+        assert [
+            category['slug'] for category in response.json()['results']
+        ] == ['trees'], (
+            'Проверьте, что поиск категорий схлопывает повторяющиеся '
+            'пробелы.'
+        )
+        response = client.get(f'{self.CATEGORY_URL}?search=игрушки')
+        assert response.json()['results'] == [], (
+            'Проверьте, что поиск категорий ищет по началу названия.'
+        )
+
+    def test_02_user_search(self, admin_client, admin, user):
+        response = admin_client.get(f'{self.USERS_URL}?search=testu')
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            found['username'] for found in response.json()['results']
+        ] == [user.username], (
+            'Проверьте, что поиск пользователей ищет по началу логина без '
+            'учета регистра.'
+        )
+
+    def test_03_partial_save(self, client, admin_client, user):
+        Category.objects.create(name='Фильм', slug='movie')
+        Category.objects.update_or_create(
+            slug='movie', defaults={'name': 'Кино'}
+        )
+        response = client.get(f'{self.CATEGORY_URL}?search=кино')
+        assert [
+            category['slug'] for category in response.json()['results']
+        ] == ['movie'], (
+            'Проверьте, что update_or_create() обновляет нормализованное '
+            'название категории.'
+        )
+
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        genre.name = 'Мелодрама'
+        genre.save(update_fields=['name'])
+        genre.refresh_from_db()
+        assert genre.name_normalized == 'мелодрама'
+
+        user.username = 'Renamed'
+        user.save(update_fields=['username'])
+        response = admin_client.get(f'{self.USERS_URL}?search=ren')
+        assert [
+            found['username'] for found in response.json()['results']
+        ] == ['Renamed']
@@ -0,0 +1,59 @@
+import pytest
+
+from reviews.models import Category, Genre, Title, UserProfile
+from reviews.text import sort_key
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15SortOrder:
+
+    def test_01_default_ordering_follows_russian_alphabet(self):
+        names = ['яблоко', 'Ёжик', 'ежевика', 'Елка', 'Жук', 'ёлка', 'Арбуз']
+        for number, name in enumerate(names):
+            Genre.objects.create(name=name, slug=f'genre-{number}')
+
+        assert list(Genre.objects.values_list('name', flat=True)) == [
+            'Арбуз', 'ежевика', 'Ёжик', 'Елка', 'ёлка', 'Жук', 'яблоко'
+        ], (
+            'Проверьте, что жанры по умолчанию сортируются по правилам '
+            'русского алфавита: без учета регистра, с «ё» рядом с «е».'
+        )
+
+        genre = Genre.objects.get(name='яблоко')
+        genre.name = 'Абрикос'
+        genre.save()
+        assert Genre.objects.values_list('name', flat=True).first() == (
+            'Абрикос'
+        ), 'Проверьте, что ключ сортировки обновляется при переименовании.'
+
+    def test_02_partial_save_updates_sort_key(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        titles = [
+            Title.objects.create(name=name, year=2000, category=category)
+            for name in ('Бег', 'Вий')
+        ]
+        titles[1].name = 'Атака'
+        titles[1].save(update_fields=['name'])
+        assert list(Title.objects.values_list('name', flat=True)) == [
+            'Атака', 'Бег'
+        ], (
+            'Проверьте, что ключ сортировки сохраняется при '
+            'save(update_fields=[...]).'
+        )
+
+    def test_03_users_follow_sort_key(self, admin_client):
+        for username in ('beta', 'Alpha', 'Борис', 'анна'):
+            UserProfile.objects.create(
+                username=username, email=f'{len(username)}{username}@ya.ru'
+            )
+        usernames = [
+            user['username']
+            for user in admin_client.get('/api/v1/users/').json()['results']
+        ]
+        assert usernames == sorted(usernames, key=sort_key), (
+            'Проверьте, что пользователи упорядочены по ключу сортировки.'
+        )
+        response = admin_client.get('/api/v1/users/?cursor=')
+        assert [
+            user['username'] for user in response.json()['results']
+        ] == usernames
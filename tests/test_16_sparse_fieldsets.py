@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SparseFieldsets:
+
+    TITLES_URL = '/api/v1/titles/'
+    CATEGORY_URL = '/api/v1/categories/'
+
+    def test_01_titles_fields(self, client, admin_client,
+                              django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'Отлично', 9)
+
+        with django_assert_max_num_queries(2) as context:
+            response = client.get(f'{self.TITLES_URL}?fields=id,name,rating')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == [
+            {'id': titles[0]['id'], 'name': titles[0]['name'], 'rating': 9},
+            {'id': titles[1]['id'], 'name': titles[1]['name'],
+             'rating': None},
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}?fields=` возвращает только '
+            'перечисленные поля.'
+        )
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'description' not in sql and 'genre' not in sql, (
+            'Проверьте, что запрос к базе не читает описание и жанры, если '
+            'они не запрошены.'
+        )
+
+        response = client.get(
+            f'{self.TITLES_URL}{titles[1]["id"]}/?omit=description,genre'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()) == {
+            'id', 'name', 'year', 'category', 'rating', 'review_count'
+        }, (
+            f'Проверьте, что `{self.TITLES_URL}{{title_id}}/?omit=` '
+            'убирает перечисленные поля.'
+        )
+
+    def test_02_other_viewsets(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(f'{self.CATEGORY_URL}?fields=slug')
+        assert response.json()['results'] == [
+            {'slug': 'films'}, {'slug': 'books'}
+        ]
+        review = create_single_review(
+            admin_client, titles[0]['id'], 'Отлично', 9
+        ).json()
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+            '?fields=id,score&cursor='
+        )
+        assert response.json()['results'] == [
+            {'id': review['id'], 'score': 9}
+        ]
+
+        for query in ('fields=author', 'omit=id,secret'):
+            response = client.get(f'{self.CATEGORY_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.CATEGORY_URL}?{query}` с '
+                'неизвестным полем возвращает ответ со статусом 400.'
+            )
@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17NormalizedPayload:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_normalized_titles(self, client, admin_client,
+                                  django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        })
+
+        with django_assert_max_num_queries(3):
+            response = client.get(
+                f'{self.TITLES_URL}?format_mode=normalized'
+            )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['results'][0]['category'] == categories[0]['slug']
+        assert sorted(data['results'][0]['genre']) == sorted(
+            titles[0]['genre']
+        ), (
+            'Проверьте, что в режиме `format_mode=normalized` произведения '
+            'ссылаются на категорию и жанры по слагу.'
+        )
+        assert data['included']['categories'] == categories
+        assert sorted(
+            data['included']['genres'], key=lambda genre: genre['slug']
+        ) == sorted(genres, key=lambda genre: genre['slug']), (
+            'Проверьте, что блок `included` содержит каждую категорию и '
+            'жанр страницы по одному разу.'
+        )
+
+        response = client.get(
+            f'{self.TITLES_URL}?format_mode=normalized&fields=id,category'
+        )
+        assert response.json()['included'] == {'categories': categories}
+
+        response = client.get(f'{self.TITLES_URL}?format_mode=flat')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ColumnarLayout:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def transpose(self, rows):
+        return {name: [row[name] for row in rows] for name in rows[0]}
+
+    def test_01_titles_columnar(self, client, admin_client, user_client,
+                                django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'Хорошо', 8)
+        create_single_review(user_client, titles[0]['id'], 'Неплохо', 7)
+
+        rows = client.get(self.TITLES_URL).json()['results']
+        expected = self.transpose(rows)
+        expected['genre'] = [
+            sorted(genre['slug'] for genre in row['genre']) for row in rows
+        ]
+        expected['category'] = [row['category']['slug'] for row in rows]
+        with django_assert_max_num_queries(3):
+            response = client.get(f'{self.TITLES_URL}?layout=columnar')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == len(titles)
+        assert data['results'] == expected, (
+            f'Проверьте, что `{self.TITLES_URL}?layout=columnar` возвращает '
+            'те же данные, что и обычный список, по массиву на поле.'
+        )
+
+        response = client.get(
+            f'{self.TITLES_URL}?layout=columnar&fields=id,rating&cursor='
+        )
+        assert response.json()['results'] == {
+            'id': expected['id'], 'rating': expected['rating']
+        }
+
+        for query in ('layout=xml', 'layout=columnar&format_mode=normalized'):
+            response = client.get(f'{self.TITLES_URL}?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.TITLES_URL}?{query}` возвращает '
+                'ответ со статусом 400.'
+            )
+
+    def test_02_reviews_columnar(self, client, admin_client, user_client,
+                                 moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        for author_client, score in (
+            (admin_client, 10), (user_client, 3), (moderator_client, 6)
+        ):
+            create_single_review(
+                author_client, titles[0]['id'], 'Отзыв', score
+            )
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+
+        rows = client.get(url).json()['results']
+        response = client.get(f'{url}?layout=columnar')
+        assert response.json()['results'] == self.transpose(rows), (
+            f'Проверьте, что `{url}?layout=columnar` возвращает отзывы по '
+            'массиву на поле.'
+        )
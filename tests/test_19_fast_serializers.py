@@ -0,0 +1,50 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19FastSerializers:
+
+    def test_01_fast_lists_match_drf(self, client, admin_client, admin,
+                                     user, user_client, moderator,
+                                     moderator_client, settings):
+        author_map = {
+            admin: admin_client, user: user_client, moderator: moderator_client
+        }
+        _, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        urls = (
+            '/api/v1/titles/',
+            '/api/v1/titles/?ordering=-rating,name',
+            '/api/v1/titles/?cursor=',
+            '/api/v1/titles/?genre=horror&facets=year',
+            '/api/v1/categories/',
+            '/api/v1/genres/?search=д',
+            reviews_url,
+            f'{reviews_url}?cursor=',
+            f'{reviews_url}{reviews[0]["id"]}/comments/',
+        )
+
+        responses = {}
+        for enabled in (False, True):
+            settings.FAST_READ_SERIALIZERS_ENABLED = enabled
+            responses[enabled] = [client.get(url).content for url in urls]
+        for url, slow, fast in zip(urls, responses[False], responses[True]):
+            assert fast == slow, (
+                f'Проверьте, что быстрый сериализатор отдает по `{url}` тот '
+                'же ответ, что и обычный, байт в байт.'
+            )
+
+    def test_02_benchmark_command(self, admin_client, admin, user,
+                                  user_client):
+        create_comments(admin_client, {admin: admin_client, user: user_client})
+        out = StringIO()
+        call_command('benchmark_serializers', '--repeat=1', stdout=out)
+        assert 'rows/s' in out.getvalue(), (
+            'Проверьте, что команда `benchmark_serializers` выводит '
+            'скорость сериализации.'
+        )
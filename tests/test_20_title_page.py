@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitlePage:
+
+    def test_01_title_page(self, client, admin_client, admin, user,
+                           user_client, moderator, moderator_client,
+                           django_assert_max_num_queries):
+        author_map = {
+            admin: admin_client, user: user_client, moderator: moderator_client
+        }
+        _, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        for number in range(3):
+            create_single_comment(
+                user_client, title_id, reviews[1]['id'], f'Ответ {number}'
+            )
+        url = f'/api/v1/titles/{title_id}/page/'
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+
+        with django_assert_max_num_queries(5):
+            response = client.get(f'{url}?reviews=2&comments_per_review=2')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        expected = client.get(f'/api/v1/titles/{title_id}/').json()
+        expected['reviews'] = client.get(reviews_url).json()['results'][:2]
+        for review in expected['reviews']:
+            review['comments'] = client.get(
+                f'{reviews_url}{review["id"]}/comments/'
+            ).json()['results'][:2]
+        assert data == expected, (
+            f'Проверьте, что `{url}` возвращает произведение с первыми '
+            'отзывами и первыми комментариями к каждому отзыву.'
+        )
+
+        response = client.get(f'{url}?comments_per_review=0')
+        assert [
+            review['comments'] for review in response.json()['reviews']
+        ] == [[], [], []]
+        assert client.get(
+            f'{url}?reviews=1000'
+        ).status_code == HTTPStatus.BAD_REQUEST
+        for missing_id in ('0', 'abc'):
+            assert client.get(
+                f'/api/v1/titles/{missing_id}/page/'
+            ).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что GET-запрос к `/api/v1/titles/{missing_id}'
+                '/page/` возвращает ответ со статусом 404.'
+            )
@@ -0,0 +1,120 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from api.v1.views import TitleViewSet
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Batch:
+
+    BATCH_URL = '/api/v1/batch/'
+
+    def test_01_batch(self, client, admin_client, user_client, user):
+        titles, categories, _ = create_titles(admin_client)
+        requests = [
+            {'url': '/api/v1/categories/'},
+            {'url': f'/api/v1/titles/{titles[0]["id"]}/?fields=id,name'},
+            {'url': '/api/v1/users/me/'},
+            {'url': '/api/v1/unknown/'},
+        ]
+
+        for concurrent in ('false', 'true'):
+            response = user_client.post(
+                f'{self.BATCH_URL}?concurrent={concurrent}',
+                data=requests,
+                format='json',
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что POST-запрос к `{self.BATCH_URL}` возвращает '
+                'ответ со статусом 200.'
+            )
+            data = response.json()
+            assert [item['status'] for item in data] == [200, 200, 200, 404]
+            assert data[0]['body']['results'] == categories
+            assert data[1]['body'] == {
+                'id': titles[0]['id'], 'name': titles[0]['name']
+            }
+            assert data[2]['body']['username'] == user.username, (
+                'Проверьте, что подзапросы выполняются с авторизацией '
+                'пакетного запроса.'
+            )
+            assert all(item['duration_ms'] >= 0 for item in data)
+
+        response = client.post(self.BATCH_URL, data=json.dumps([
+            {'url': '/api/v1/users/me/'},
+            {'method': 'POST', 'url': '/api/v1/categories/',
+             'body': {'name': 'Музыка', 'slug': 'music'}},
+        ]), content_type='application/json')
+        assert [item['status'] for item in response.json()] == [401, 401]
+
+        response = admin_client.post(self.BATCH_URL, data=[
+            {'method': 'POST', 'url': '/api/v1/categories/',
+             'body': {'name': 'Музыка', 'slug': 'music'}},
+            {'url': '/api/v1/categories/?search=муз'},
+        ], format='json')
+        data = response.json()
+        assert data[0]['status'] == HTTPStatus.CREATED
+        assert data[1]['body']['results'] == [
+            {'name': 'Музыка', 'slug': 'music'}
+        ], 'Проверьте, что подзапросы пакета выполняются по порядку.'
+
+        for invalid in (
+            [],
+            [{'url': '/api/v1/batch/'}],
+            [{'url': '/api/v1/%62atch/'}],
+            [{'url': 'https://example.com/'}],
+            [{'url': '/api/v1/genres/'}] * 21,
+        ):
+            response = client.post(
+                self.BATCH_URL,
+                data=json.dumps(invalid),
+                content_type='application/json',
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_failing_items(self, admin_client, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post(self.BATCH_URL, data=[
+            {'url': '/api/v1/'},
+            {'url': '/api/v1/titles/abc/stats/'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item['status'] for item in data] == [200, 404], (
+            'Проверьте, что подзапросы к корню API и к несуществующему '
+            'произведению выполняются.'
+        )
+        assert 'titles' in data[0]['body']
+
+        def broken_stats(view, request, pk=None):
+            raise RuntimeError('stats failed')
+
+        monkeypatch.setattr(TitleViewSet, 'stats', broken_stats)
+        response = admin_client.post(self.BATCH_URL, data=[
+            {'url': f'/api/v1/titles/{titles[0]["id"]}/stats/'},
+            {'url': '/api/v1/categories/'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ошибка подзапроса не прерывает весь пакет.'
+        )
+        assert [item['status'] for item in response.json()] == [500, 200], (
+            'Проверьте, что ошибка подзапроса возвращается в ответе '
+            'этого подзапроса со статусом 500.'
+        )
+
+    def test_03_encoded_paths(self, admin_client, django_user_model):
+        django_user_model.objects.create(username='иван', email='i@ya.ru')
+        response = admin_client.post(self.BATCH_URL, data=[
+            {'url': '/api/v1/users/%D0%B8%D0%B2%D0%B0%D0%BD/'},
+            {'url': '/api/v1/users/иван/'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [item['status'] for item in data] == [200, 200], (
+            'Проверьте, что адреса подзапросов в процентной кодировке '
+            'разрешаются так же, как в обычном запросе.'
+        )
+        assert {item['body']['username'] for item in data} == {'иван'}
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleMultiGet:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_by_ids(self, client, admin_client, settings,
+                              django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        ids = [titles[0]['id']]
+        for number in range(25):
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': f'Сиквел {number}',
+                'year': 1990,
+                'genre': [genres[number % 3]['slug']],
+                'category': categories[number % 2]['slug'],
+            })
+            ids.append(response.json()['id'])
+        query = ','.join(map(str, reversed(ids + [0])))
+
+        for fast in (False, True):
+            settings.FAST_READ_SERIALIZERS_ENABLED = fast
+            with django_assert_max_num_queries(3):
+                response = client.get(f'{self.TITLES_URL}?ids={query}')
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert [title['id'] for title in data['results']] == ids, (
+                f'Проверьте, что `{self.TITLES_URL}?ids=` возвращает все '
+                'запрошенные произведения одной страницей.'
+            )
+            assert data['results'][0]['genre'] and data['count'] == len(ids)
+
+        response = client.get(
+            f'{self.TITLES_URL}?ids={",".join(["1"] * 301)}'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(f'{self.TITLES_URL}?ids=1,abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        for query in (',', ''):
+            response = client.get(f'{self.TITLES_URL}?ids={query}')
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что пустой `{self.TITLES_URL}?ids=` не '
+                'ограничивает список.'
+            )
+            data = response.json()
+            assert data['count'] == len(titles) + 25
+            assert len(data['results']) < data['count']
+        response = client.get(f'{self.TITLES_URL}?ids={ids[0]},')
+        assert [title['id'] for title in response.json()['results']] == [
+            ids[0]
+        ]
@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleBulk:
+
+    TITLES_URL = '/api/v1/titles/'
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_create_and_update(self, client, admin_client,
+                                       user_client,
+                                       django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        assert client.get(self.TITLES_URL).json()['count'] == 2
+        rows = [
+            {'name': f'Сериал {number}', 'year': 1950 + number,
+             'genre': ['drama'], 'category': 'films'}
+            for number in range(30)
+        ] + [
+            {'id': titles[0]['id'], 'name': 'Терминатор 2', 'year': 1991,
+             'genre': ['comedy', 'drama'], 'category': 'books'},
+        ]
+
+        assert user_client.post(
+            self.BULK_URL, data=rows, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN
+        with django_assert_max_num_queries(20):
+            response = admin_client.post(
+                self.BULK_URL, data=rows, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 201.'
+        )
+        data = response.json()
+        assert len(data['created']) == 30
+        assert data['updated'] == [titles[0]['id']]
+
+        listing = client.get(self.TITLES_URL).json()
+        assert listing['count'] == 32, (
+            'Проверьте, что пакетная запись сбрасывает кэш количества.'
+        )
+        title = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/').json()
+        assert (title['name'], title['year'], title['category']['slug']) == (
+            'Терминатор 2', 1991, 'books'
+        )
+        assert sorted(genre['slug'] for genre in title['genre']) == [
+            'comedy', 'drama'
+        ]
+        created = client.get(f'{self.TITLES_URL}{data["created"][0]}/').json()
+        assert created['genre'] == [{'name': 'Драма', 'slug': 'drama'}]
+        assert client.get(
+            f'{self.TITLES_URL}{data["created"][0]}/stats/'
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что у созданных пакетом произведений есть '
+            'распределение оценок.'
+        )
+        fuzzy = client.get(f'{self.TITLES_URL}fuzzy/?q=Терминатор 2').json()
+        assert fuzzy[0]['id'] == titles[0]['id'], (
+            'Проверьте, что пакетное переименование обновляет триграммы.'
+        )
+        assert client.get(
+            '/api/v1/autocomplete/?q=сериал&kind=title&limit=50'
+        ).json()[0]['name'].startswith('Сериал')
+
+    def test_02_bulk_errors(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.post(self.BULK_URL, data=[
+            {'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+             'category': 'films'},
+            {'name': 'Чужие', 'year': 1986, 'genre': ['horror', 'sci-fi'],
+             'category': 'cartoons'},
+            {'id': 0, 'name': 'Ничто', 'year': 3000, 'genre': [],
+             'category': 'films'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {} and set(errors[2]) == {'id', 'year', 'genre'}
+
+        response = admin_client.post(self.BULK_URL, data=[
+            {'name': 'Чужой', 'year': 1979, 'genre': ['horror'],
+             'category': 'films'},
+            {'name': 'Чужие', 'year': 1986, 'genre': ['horror', 'sci-fi'],
+             'category': 'cartoons'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {} and set(errors[1]) == {'genre', 'category'}, (
+            'Проверьте, что ошибки пакетной записи возвращаются по строкам.'
+        )
+        assert admin_client.get(self.TITLES_URL).json()['count'] == 2, (
+            'Проверьте, что пакет с ошибками не записывается частично.'
+        )
+
+        response = admin_client.post(self.BULK_URL, data=[
+            {'id': titles[1]['id'], 'name': 'Крепкий орешек 2', 'year': 1990,
+             'genre': ['drama'], 'category': 'films'},
+            {'id': titles[1]['id'], 'name': 'Крепкий орешек 3', 'year': 1995,
+             'genre': ['drama'], 'category': 'films'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.json()[1]) == {'id'}
+
+        response = admin_client.post(self.BULK_URL, data=[
+            {'id': titles[1]['id'], 'name': 'Крепкий орешек 2', 'year': 1990,
+             'genre': ['drama'], 'category': 'films'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что пакет только из обновлений возвращает ответ со '
+            'статусом 200.'
+        )
+        assert response.json() == {
+            'created': [], 'updated': [titles[1]['id']]
+        }
@@ -0,0 +1,176 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.aggregates import SCORES, actual_title_scores
+from reviews.models import Category, Review, Title
+from tests.utils import (
+    create_single_comment,
+    create_single_review,
+    create_titles,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24BulkModeration:
+
+    REVIEWS_URL = '/api/v1/moderation/reviews/delete/'
+    COMMENTS_URL = '/api/v1/moderation/comments/delete/'
+    TITLE_URL = '/api/v1/titles/{title_id}/'
+    REVIEW_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+    def create_data(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews = {}
+        for title, scores in zip(titles, ((9, 2, 7), (4, 10, 1))):
+            for client, score in zip(
+                (admin_client, user_client, moderator_client), scores
+            ):
+                reviews[title['id'], client] = create_single_review(
+                    client, title['id'], f'Оценка {score}', score
+                ).json()['id']
+        for client in (admin_client, user_client, user_client):
+            create_single_comment(
+                client, titles[0]['id'],
+                reviews[titles[0]['id'], admin_client], 'Комментарий'
+            )
+            create_single_comment(
+                client, titles[0]['id'],
+                reviews[titles[0]['id'], user_client], 'Спам'
+            )
+        return titles, reviews
+
+    def check_counters(self, client, titles):
+        actual = actual_title_scores([title['id'] for title in titles])
+        for title in titles:
+            buckets = actual.get(title['id'], [0] * len(SCORES))
+            stats = client.get(
+                f'{self.TITLE_URL.format(title_id=title["id"])}stats/'
+            ).json()
+            assert list(stats['histogram'].values()) == buckets, (
+                'Проверьте, что пакетное удаление обновляет распределение '
+                'оценок произведения.'
+            )
+            stored = Title.objects.get(id=title['id'])
+            count = sum(buckets)
+            assert stored.rating_count == count
+            assert stored.rating_sum == sum(
+                score * bucket for score, bucket in zip(SCORES, buckets)
+            )
+            assert stored.rating == (
+                stored.rating_sum / count if count else None
+            )
+
+    def test_01_delete_reviews(self, client, admin_client, user_client,
+                               moderator_client, user):
+        titles, reviews = self.create_data(
+            admin_client, user_client, moderator_client
+        )
+        for data_client in (client, user_client):
+            response = data_client.post(
+                self.REVIEWS_URL, data={'author': user.username},
+                format='json'
+            )
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что `{self.REVIEWS_URL}` доступен только '
+                'модератору и администратору.'
+            )
+        for data in ({}, {'since': '2030-01-01T00:00', 'until': '2020-01-01'}):
+            response = moderator_client.post(
+                self.REVIEWS_URL, data=data, format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        response = moderator_client.post(
+            self.REVIEWS_URL, data={'author': user.username}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'deleted': {'reviews': 2, 'comments': 3},
+            'titles': sorted(title['id'] for title in titles),
+        }, (
+            f'Проверьте, что `{self.REVIEWS_URL}` удаляет отзывы автора '
+            'вместе с комментариями и возвращает сводку.'
+        )
+        self.check_counters(client, titles)
+        title = client.get(self.TITLE_URL.format(title_id=titles[0]['id']))
+        assert title.json()['review_count'] == 2
+        reviews_url = (
+            f'{self.TITLE_URL.format(title_id=titles[1]["id"])}reviews/'
+        )
+        assert client.get(reviews_url).json()['count'] == 2, (
+            'Проверьте, что кэш количества отзывов сбрасывается после '
+            'пакетного удаления.'
+        )
+
+        response = admin_client.post(self.REVIEWS_URL, data={
+            'title': titles[1]['id'],
+            'ids': [reviews[titles[1]['id'], moderator_client],
+                    reviews[titles[0]['id'], admin_client]],
+        }, format='json')
+        assert response.json()['deleted'] == {'reviews': 1, 'comments': 0}
+        self.check_counters(client, titles)
+
+    def test_02_delete_comments(self, client, admin_client, user_client,
+                                moderator_client, user):
+        titles, reviews = self.create_data(
+            admin_client, user_client, moderator_client
+        )
+        response = moderator_client.post(
+            self.COMMENTS_URL, data={'author': user.username}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'deleted': {'comments': 4},
+            'reviews': sorted((
+                reviews[titles[0]['id'], admin_client],
+                reviews[titles[0]['id'], user_client],
+            )),
+        }
+        for review_client in (admin_client, user_client):
+            review_url = self.REVIEW_URL.format(
+                title_id=titles[0]['id'],
+                review_id=reviews[titles[0]['id'], review_client],
+            )
+            assert client.get(review_url).json()['comment_count'] == 1, (
+                f'Проверьте, что `{self.COMMENTS_URL}` обновляет счетчик '
+                'комментариев отзыва.'
+            )
+            assert client.get(
+                f'{review_url}comments/'
+            ).json()['count'] == 1
+
+        response = moderator_client.post(self.COMMENTS_URL, data={
+            'review': reviews[titles[0]['id'], user_client],
+            'since': '2000-01-01T00:00:00Z',
+        }, format='json')
+        assert response.json()['deleted'] == {'comments': 1}
+
+    def test_03_counters_in_grouped_updates(self, client, moderator_client,
+                                            user, admin,
+                                            django_assert_max_num_queries):
+        category = Category.objects.create(name='Фильм', slug='films')
+        titles = []
+        for number in range(12):
+            title = Title.objects.create(
+                name=f'Фильм {number}', year=2000, category=category
+            )
+            Review.objects.create(
+                author=user, title=title, text='Спам', score=number % 10 + 1
+            )
+            Review.objects.create(
+                author=admin, title=title, text='Отзыв', score=7
+            )
+            titles.append({'id': title.id})
+        with django_assert_max_num_queries(12):
+            response = moderator_client.post(
+                self.REVIEWS_URL, data={'author': user.username},
+                format='json'
+            )
+        assert response.json()['deleted'] == {'reviews': 12, 'comments': 0}, (
+            'Проверьте, что число запросов пакетного удаления не зависит от '
+            'числа затронутых произведений.'
+        )
+        self.check_counters(client, titles)